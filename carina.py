@@ -68,7 +68,7 @@ try:
         from utils.paths import resource_path, get_base_output_dir
         from central_controller import CentralController # <<< NECESSÁRIO
         from main import run_ai_process # <<< NECESSÁRIO
-        from watchdog import run_watchdog # <<< NECESSÁRIO
+        from watchdog import run_watchdog, WATCHDOG_QUEUE_SIZE # <<< NECESSÁRIO
         from utils.logging_setup import setup_logging
         from sds.dashboard_worker import run_sds_worker # <<< NECESSÁRIO
         from sas.analysis_worker import run_analysis_worker # <<< NECESSÁRIO
@@ -81,7 +81,7 @@ try:
         from src.utils.paths import resource_path, get_base_output_dir
         from src.central_controller import CentralController # <<< NECESSÁRIO
         from src.main import run_ai_process # <<< NECESSÁRIO
-        from src.watchdog import run_watchdog # <<< NECESSÁRIO
+        from src.watchdog import run_watchdog, WATCHDOG_QUEUE_SIZE # <<< NECESSÁRIO
         from src.utils.logging_setup import setup_logging
         from src.sds.dashboard_worker import run_sds_worker # <<< NECESSÁRIO
         from src.sas.analysis_worker import run_analysis_worker # <<< NECESSÁRIO
@@ -257,7 +257,8 @@ def main():
 
     # --- Criação das Queues e Pipe (TODAS necessárias) ---
     controller_conn, ai_conn = Pipe() # <<< NECESSÁRIO
-    watchdog_command_queue = Queue() # <<< NECESSÁRIO
+    watchdog_command_queue = Queue(maxsize=WATCHDOG_QUEUE_SIZE) # <<< NECESSÁRIO (limitada: ver watchdog.py)
+    watchdog_stop_event = multiprocessing.Event() # Permite encerrar o Watchdog sem esperar o intervalo
     sds_data_queue = Queue()         # <<< NECESSÁRIO
     sas_data_queue = Queue()         # <<< NECESSÁRIO
     ui_command_queue = Queue()         # <<< NECESSÁRIO
@@ -307,7 +308,7 @@ def main():
         processes.append(central_process)
         ai_process = Process(target=run_ai_process, args=(ai_conn, guardian_state_queue, guardian_signal_queue, db_data_queue), name="AI_Process") # <<< Mantido
         processes.append(ai_process)
-        watchdog_process = Process(target=run_watchdog, args=(watchdog_command_queue, lm), name="Watchdog") # <<< Mantido
+        watchdog_process = Process(target=run_watchdog, args=(watchdog_command_queue, lm, watchdog_stop_event), name="Watchdog") # <<< Mantido
         processes.append(watchdog_process)
         sds_process = Process(target=run_sds_worker, args=(sds_data_queue, settings, ui_command_queue), name="DashboardService") # <<< ADICIONADO
         processes.append(sds_process)
@@ -385,6 +386,9 @@ def main():
         except Exception as e:
             logging.warning(f"Error sending shutdown signal to DB worker queue: {e}")
 
+        # Sinaliza o Watchdog para sair do loop imediatamente
+        watchdog_stop_event.set()
+
         logging.info("Performing final cleanup of backend processes...")
         # Termina todos os processos do backend na ordem inversa
         for p in reversed(processes):
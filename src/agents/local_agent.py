@@ -108,11 +108,16 @@ class LocalAgent:
         }
         torch.save(checkpoint, filepath)
 
-    def load_checkpoint(self, filepath: str):
-        """Carrega o estado do agente, incluindo a memória XAI, de um arquivo de checkpoint."""
+    def load_checkpoint(self, filepath: str, checkpoint: dict | None = None):
+        """
+        Carrega o estado do agente, incluindo a memória XAI, de um arquivo de checkpoint.
+        Se o chamador já tiver desserializado o arquivo, pode passá-lo em 'checkpoint'
+        para evitar uma segunda leitura.
+        """
         lm = self.locale_manager
         try:
-            checkpoint = torch.load(filepath, map_location=self.device, weights_only=False)
+            if checkpoint is None:
+                checkpoint = torch.load(filepath, map_location=self.device, weights_only=False)
             
             if self.n_observations != checkpoint.get('n_observations'):
                 # --- MUDANÇA 3 ---
@@ -36,6 +36,13 @@ from typing import Dict, Any, List
 from .paths import resource_path
 # --- FIM DA MUDANÇA 1 ---
 
+# Sentinela para distinguir "chave ausente" de valores armazenados no JSON.
+_MISS = object()
+
+# Caminhos resolvidos uma única vez por processo (não mudam em tempo de execução).
+_LOCALES_DIR = resource_path(os.path.join("src", "locale_backend"))
+_CONFIG_PATH = resource_path(os.path.join("config", "settings.ini"))
+
 class LocaleManagerBackend:
     """
     Gerencia o carregamento e o acesso às strings de tradução do backend.
@@ -46,7 +53,7 @@ class LocaleManagerBackend:
         de idioma diretamente do settings.ini usando resource_path.
         """
         # --- MUDANÇA 2: Usar resource_path para definir o diretório de locales ---
-        self.locales_dir = resource_path(os.path.join("src", "locale_backend"))
+        self.locales_dir = _LOCALES_DIR
         # --- FIM DA MUDANÇA 2 ---
 
         self.fallback_lang_code = "en_us"
@@ -55,7 +62,7 @@ class LocaleManagerBackend:
         self.fallback_lang_data: Dict[str, Any] = {}
 
         # --- MUDANÇA 3: Usar resource_path para ler o settings.ini ---
-        config_path = resource_path(os.path.join("config", "settings.ini"))
+        config_path = _CONFIG_PATH
         # --- FIM DA MUDANÇA 3 ---
 
         config = configparser.ConfigParser()
@@ -113,16 +120,17 @@ class LocaleManagerBackend:
         """
         temp_dict = data
         for key in keys:
-            if isinstance(temp_dict, dict) and key in temp_dict:
-                temp_dict = temp_dict[key]
-            else:
+            # Uma única busca no hash por nível (get + sentinela) em vez de 'in' + '[]'.
+            temp_dict = temp_dict.get(key, _MISS) if isinstance(temp_dict, dict) else _MISS
+            if temp_dict is _MISS:
                 return None
         return str(temp_dict) if isinstance(temp_dict, (str, int, float, bool)) else None
 
-    def get_string(self, key: str, fallback: str = None, **kwargs) -> str:
+    def get_template(self, key: str, fallback: str = None) -> str:
         """
-        Obtém uma string de tradução e formata com os argumentos fornecidos.
-        Implementa a lógica de fallback para o inglês.
+        Obtém a string de tradução crua (sem formatar os placeholders), com a
+        mesma lógica de fallback de get_string. Útil para resolver a chave uma
+        única vez e formatar o modelo depois, em caminhos repetitivos.
         """
         keys = key.split('.')
 
@@ -138,6 +146,15 @@ class LocaleManagerBackend:
                 # Se não há fallback nem no arquivo nem explícito, loga erro e retorna a chave
                 logging.error(f"[LocaleManagerBackend] Chave '{key}' não encontrada em nenhum arquivo de tradução.")
                 return key
+        return translation
+
+    def get_string(self, key: str, fallback: str = None, **kwargs) -> str:
+        """
+        Obtém uma string de tradução e formata com os argumentos fornecidos.
+        Implementa a lógica de fallback para o inglês.
+        """
+        # Uma chave ausente volta como a própria chave, que não tem placeholders.
+        translation = self.get_template(key, fallback)
 
         try:
             return translation.format(**kwargs)
@@ -69,7 +69,8 @@ def generate_map_data_files(net_file_path: str, output_dir: str, lm: 'LocaleMana
     # --- MUDANÇA 5 ---
     logging.info(lm.get_string("map_generator.run.generating_files"))
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8')
+        # O stdout do netconvert nunca é usado; apenas o stderr é lido em caso de falha.
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, encoding='utf-8')
         
         if os.path.exists(output_prefix_path + ".nod.xml"):
             # --- MUDANÇA 6 ---
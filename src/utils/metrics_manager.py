@@ -25,8 +25,15 @@ de métricas para o Prometheus.
 
 import logging
 import threading
+from typing import Dict
 from prometheus_client import start_http_server, Gauge, Counter
 
+# Servidores HTTP já iniciados neste processo, indexados pela porta.
+# Evita threads duplicadas e erros de "address already in use" quando mais de
+# um MetricsManager é criado com a mesma porta.
+_SERVERS: Dict[int, threading.Thread] = {}
+_SERVERS_LOCK = threading.Lock()
+
 class MetricsManager:
     """
     Uma caixa de ferramentas para criar, gerenciar e expor métricas do Prometheus
@@ -40,22 +47,41 @@ class MetricsManager:
             process_name (str): O nome do processo (ex: 'AI_Process', 'SDS_Worker').
                                 Será usado como uma label nas métricas.
             port (int): A porta TCP onde o servidor de métricas irá escutar.
+                        Um valor <= 0 desativa o servidor HTTP.
         """
         self.process_name = process_name
         self.port = port
         self.metrics = {}
+        # Método de atualização de cada métrica (set/inc), já vinculado à label
+        # 'process_name', que é fixa por processo.
+        self._updaters = {}
         
         # Inicia o servidor HTTP em uma thread daemon para não bloquear o processo
         self.start_server()
 
     def start_server(self):
-        """Inicia o servidor HTTP do Prometheus em uma thread separada."""
+        """
+        Inicia o servidor HTTP do Prometheus em uma thread separada.
+
+        Não faz nada se a porta for <= 0 (métricas desativadas) ou se já
+        existir um servidor iniciado nesta porta dentro do mesmo processo.
+        """
+        if self.port <= 0:
+            logging.debug(f"[{self.process_name}-METRICS] Servidor Prometheus desativado (porta {self.port}).")
+            return
+
         try:
-            server_thread = threading.Thread(
-                target=lambda: start_http_server(self.port), 
-                daemon=True
-            )
-            server_thread.start()
+            with _SERVERS_LOCK:
+                if self.port in _SERVERS:
+                    logging.debug(f"[{self.process_name}-METRICS] Reutilizando o servidor Prometheus já ativo na porta {self.port}.")
+                    return
+
+                server_thread = threading.Thread(
+                    target=lambda: start_http_server(self.port), 
+                    daemon=True
+                )
+                server_thread.start()
+                _SERVERS[self.port] = server_thread
             logging.info(f"[{self.process_name}-METRICS] Servidor Prometheus iniciado na porta {self.port}")
         except Exception as e:
             logging.error(f"[{self.process_name}-METRICS] Falha ao iniciar o servidor Prometheus: {e}")
@@ -84,6 +110,9 @@ class MetricsManager:
                 return
             
             self.metrics[name] = metric
+            child = metric.labels(process_name=self.process_name)
+            # Para contadores, geralmente incrementamos, mas 'inc' com valor permite flexibilidade
+            self._updaters[name] = child.set if metric_type == 'gauge' else child.inc
             logging.debug(f"[{self.process_name}-METRICS] Métrica '{name}' registrada.")
         except Exception as e:
             logging.error(f"[{self.process_name}-METRICS] Falha ao registrar a métrica '{name}': {e}")
@@ -96,14 +125,6 @@ class MetricsManager:
             name (str): O nome da métrica a ser atualizada.
             value (float): O novo valor para a métrica.
         """
-        if name not in self.metrics:
-            return
-
-        metric = self.metrics[name]
-        
-        # O método de atualização depende do tipo de métrica
-        if isinstance(metric, Gauge):
-            metric.labels(process_name=self.process_name).set(value)
-        elif isinstance(metric, Counter):
-            # Para contadores, geralmente incrementamos, mas 'inc' com valor permite flexibilidade
-            metric.labels(process_name=self.process_name).inc(value)
\ No newline at end of file
+        updater = self._updaters.get(name)
+        if updater is not None:
+            updater(value)
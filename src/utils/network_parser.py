@@ -42,12 +42,13 @@ def build_lane_to_edge_map(net_file_path: str, lm: 'LocaleManagerBackend') -> di
             tree = ET.parse(f)
         
         root = tree.getroot()
-        for edge in root.findall("edge"):
+        # iterfind evita materializar a lista completa de elementos de uma vez.
+        for edge in root.iterfind("edge"):
             edge_id = edge.get("id")
             if not edge_id or edge_id.startswith(":"):
                 continue
             
-            for lane in edge.findall("lane"):
+            for lane in edge.iterfind("lane"):
                 lane_id = lane.get("id")
                 if lane_id:
                     lane_to_edge_map[lane_id] = edge_id
@@ -81,29 +82,33 @@ def build_structural_neighborhood_map(net_file_path: str, tls_ids_in_sim: list,
             tree = ET.parse(net_file_path)
         
         root = tree.getroot()
-        for edge in root.findall("edge"):
-            from_junction = edge.get("from")
-            to_junction = edge.get("to")
+        for edge in root.iterfind("edge"):
+            get = edge.get
+            from_junction = get("from")
+            to_junction = get("to")
             if from_junction and to_junction:
                 junction_connections[from_junction].append(to_junction)
                 junction_connections[to_junction].append(from_junction)
 
         for start_node in tls_junctions:
-            queue = deque([(start_node, [start_node])])
+            # A fronteira guarda apenas o ID do nó: o caminho percorrido nunca é usado.
+            queue = deque((start_node,))
             visited = {start_node}
+            queue_append = queue.append
+            queue_popleft = queue.popleft
+            visited_add = visited.add
 
             while queue:
-                current_node, path = queue.popleft()
+                current_node = queue_popleft()
 
                 for neighbor in junction_connections[current_node]:
                     if neighbor not in visited:
-                        visited.add(neighbor)
-                        new_path = path + [neighbor]
+                        visited_add(neighbor)
 
                         if neighbor in tls_junctions:
                             neighborhoods[start_node].add(neighbor)
                         else:
-                            queue.append((neighbor, new_path))
+                            queue_append(neighbor)
         
         final_neighborhoods = defaultdict(list)
         for tl_id, neighbors_set in neighborhoods.items():
@@ -18,15 +18,88 @@
 # Author: Gabriel Moraes
 # Date: 13 de Outubro de 2025
 
+import io
 import logging
-import xml.etree.ElementTree as ET
-import gzip
+import os
+import pickle
+import sys
+from xml.parsers import expat
 from collections import defaultdict
-from typing import TYPE_CHECKING, Tuple, Dict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Tuple, Dict, Mapping
 
 if TYPE_CHECKING:
     from .locale_manager_backend import LocaleManagerBackend
 
+# O igzip do python-isal (ISA-L) é compatível com a API do gzip e descomprime
+# bem mais rápido. É opcional: sem ele, usamos o gzip da biblioteca padrão.
+try:
+    from isal import igzip as gzip
+except ImportError:
+    import gzip
+
+# Tamanho do buffer de leitura (mesmo valor de gzip.READ_BUFFER_SIZE no CPython
+# recente). Reduz as idas e voltas ao zlib/SO em redes de centenas de MB.
+READ_BUFFER_SIZE = 128 * 1024
+
+# Resultado vazio (e somente leitura) devolvido em caso de erro. É partilhado
+# por referência; uma escrita acidental lança TypeError em vez de passar em silêncio.
+_EMPTY_INCOMING: Mapping[str, Any] = MappingProxyType({})
+
+# Sufixo do cache da topologia, salvo ao lado do ficheiro de rede.
+TOPOLOGY_CACHE_SUFFIX = ".topo.pkl"
+# Versão do formato do cache. Deve ser incrementada sempre que a estrutura
+# devolvida por build() mudar: um cache de outra versão é descartado.
+TOPOLOGY_CACHE_VERSION = 1
+
+class _TopologyHandler:
+    """
+    Handler de eventos do expat que extrai a topologia sem criar nenhum objeto
+    Element: o tipo de cada junção e as faixas (lanes) de cada rua que chega a ela.
+
+    Os callbacks são ligados diretamente ao parser expat, que entrega os
+    atributos como um dict construído em C (sem a camada de wrappers do xml.sax).
+
+    Os IDs são internados (uma única instância de str por ID) e as faixas são
+    guardadas como tuplas, mais compactas que listas, já que não mudam depois.
+    """
+    def __init__(self, junction_types: Dict, junction_incoming_edges: Dict):
+        self.junction_types = junction_types
+        self.junction_incoming_edges = junction_incoming_edges
+        self._cur_j_id = None
+        self._cur_edge_id = None
+        self._cur_lanes = None
+
+    def startElement(self, name, attrs):
+        # Máquina de estados linear: as faixas são acumuladas à medida que passam
+        # no fluxo, apenas para ruas que serão mantidas (com 'to' e 'id'). Ruas
+        # internas (sem 'to') não alocam lista nenhuma.
+        if name == 'lane':
+            if self._cur_lanes is not None:
+                lane_id = attrs.get('id')
+                self._cur_lanes.append(sys.intern(lane_id) if lane_id else lane_id)
+        elif name == 'edge':
+            j_id = attrs.get('to')
+            edge_id = attrs.get('id')
+            if j_id and edge_id:
+                self._cur_j_id = sys.intern(j_id)
+                self._cur_edge_id = sys.intern(edge_id)
+                self._cur_lanes = []
+        elif name == 'junction':
+            # Extrai o tipo de cada junção (ex: 'traffic_light')
+            j_id = attrs.get('id')
+            j_type = attrs.get('type')
+            if j_id and j_type:
+                self.junction_types[sys.intern(j_id)] = sys.intern(j_type)
+
+    def endElement(self, name):
+        if name != 'edge' or self._cur_lanes is None:
+            return
+        # Mapeia as ruas (edges) que chegam a cada junção
+        lanes = self._cur_lanes
+        self.junction_incoming_edges[self._cur_j_id][self._cur_edge_id] = {'lanes': tuple(lanes), 'num_lanes': len(lanes)}
+        self._cur_j_id = self._cur_edge_id = self._cur_lanes = None
+
 class NetworkTopologyParser:
     """
     Um especialista em ler um ficheiro .net.xml do SUMO e extrair
@@ -49,37 +122,71 @@ class NetworkTopologyParser:
             Uma tupla contendo (tipos_de_juncao, arestas_de_entrada_por_juncao).
         """
         lm = self.locale_manager
+
+        cached = self._load_cache(net_file_path)
+        if cached is not None:
+            return cached
+
         junction_types = {}
         junction_incoming_edges = defaultdict(dict)
 
         try:
-            opener = gzip.open if net_file_path.endswith('.gz') else open
-            with opener(net_file_path, 'rb') as f:
-                tree = ET.parse(f)
-            
-            root = tree.getroot()
+            if net_file_path.endswith('.gz'):
+                f = io.BufferedReader(gzip.open(net_file_path, 'rb'), buffer_size=READ_BUFFER_SIZE)
+            else:
+                f = open(net_file_path, 'rb', buffering=READ_BUFFER_SIZE)
+            with f:
+                # Leitura em streaming (expat): nenhuma árvore é montada em memória.
+                handler = _TopologyHandler(junction_types, junction_incoming_edges)
+                parser = expat.ParserCreate()
+                parser.buffer_text = True
+                parser.StartElementHandler = handler.startElement
+                parser.EndElementHandler = handler.endElement
+                parser.ParseFile(f)
 
-            # Extrai o tipo de cada junção (ex: 'traffic_light')
-            for junction in root.findall('junction'):
-                j_id = junction.get('id')
-                j_type = junction.get('type')
-                if j_id and j_type:
-                    junction_types[j_id] = j_type
-
-            # Mapeia as ruas (edges) que chegam a cada junção
-            for edge in root.findall('edge'):
-                j_id = edge.get('to')
-                edge_id = edge.get('id')
-                if j_id and edge_id:
-                    lanes = [lane.get('id') for lane in edge.findall('lane')]
-                    junction_incoming_edges[j_id][edge_id] = {'lanes': lanes, 'num_lanes': len(lanes)}
-        
         except FileNotFoundError:
              logging.error(f"[TopologyParser] Ficheiro de rede não encontrado em: {net_file_path}")
-             return {}, defaultdict(dict)
+             return {}, _EMPTY_INCOMING
         except Exception as e:
             # A chave de tradução já existe no backend.json
             logging.error(lm.get_string("sas_engine.topology.critical_error", error=e), exc_info=True)
-            return {}, defaultdict(dict)
+            return {}, _EMPTY_INCOMING
         
-        return junction_types, junction_incoming_edges
\ No newline at end of file
+        if junction_types:
+            self._save_cache(net_file_path, junction_types, junction_incoming_edges)
+        return junction_types, junction_incoming_edges
+
+    def _load_cache(self, net_file_path: str) -> Tuple[Dict, Dict] | None:
+        """
+        Carrega a topologia já processada se o cache for mais recente que o
+        ficheiro de rede e tiver a versão de formato atual. Retorna None se
+        não houver cache válido.
+        """
+        cache_path = net_file_path + TOPOLOGY_CACHE_SUFFIX
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(net_file_path):
+                return None
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+            if not (isinstance(cached, tuple) and len(cached) == 3 and cached[0] == TOPOLOGY_CACHE_VERSION):
+                logging.info(f"[TopologyParser] Cache de topologia em formato antigo em '{cache_path}', a reprocessar a rede.")
+                return None
+            _, junction_types, junction_incoming_edges = cached
+            logging.info(f"[TopologyParser] Topologia carregada do cache: {cache_path}")
+            return junction_types, junction_incoming_edges
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"[TopologyParser] Cache de topologia inválido em '{cache_path}', a reprocessar a rede. Erro: {e}")
+            return None
+
+    def _save_cache(self, net_file_path: str, junction_types: Dict, junction_incoming_edges: Dict):
+        """Salva a topologia processada ao lado do ficheiro de rede (melhor esforço)."""
+        cache_path = net_file_path + TOPOLOGY_CACHE_SUFFIX
+        tmp_path = cache_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((TOPOLOGY_CACHE_VERSION, junction_types, junction_incoming_edges), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"[TopologyParser] Não foi possível salvar o cache de topologia em '{cache_path}': {e}")
\ No newline at end of file
@@ -25,7 +25,15 @@ garantindo compatibilidade com PyInstaller (--onefile).
 
 import sys
 import os
+from functools import lru_cache
 
+# Raiz dos recursos, resolvida uma única vez na importação.
+# PyInstaller cria uma pasta temporária e armazena o caminho em _MEIPASS.
+# Se _MEIPASS não existe, estamos em modo de desenvolvimento: subimos dois
+# níveis a partir de src/utils para chegar na raiz do projeto.
+_RESOURCE_BASE = getattr(sys, '_MEIPASS', None) or os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+@lru_cache(maxsize=256)
 def resource_path(relative_path: str) -> str:
     """
     Retorna o caminho absoluto para um recurso (arquivo de dados),
@@ -39,17 +47,9 @@ def resource_path(relative_path: str) -> str:
     Returns:
         str: O caminho absoluto para o recurso.
     """
-    try:
-        # PyInstaller cria uma pasta temporária e armazena o caminho em _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        # Se _MEIPASS não existe, estamos em modo de desenvolvimento.
-        # Usamos abspath(".") para obter a raiz do projeto onde o script/comando é executado.
-        # Ajustamos para subir dois níveis a partir de src/utils para chegar na raiz.
-        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-
-    return os.path.join(base_path, relative_path)
+    return os.path.join(_RESOURCE_BASE, relative_path)
 
+@lru_cache(maxsize=None)
 def get_base_output_dir() -> str:
     """
     Retorna o diretório base onde arquivos de saída (logs, results) devem ser escritos.
@@ -59,6 +59,12 @@ class SettingsManager:
         'update_frequency_seconds': 'GAT_STRATEGIST' # Adicionado GAT
     }
 
+    # Índice invertido (seção -> chaves), para ler cada seção uma única vez.
+    _SECTION_TO_KEYS: Dict[str, list] = {}
+    for _key, _section in _KEY_TO_SECTION_MAP.items():
+        _SECTION_TO_KEYS.setdefault(_section, []).append(_key)
+    del _key, _section
+
     def __init__(self):
         """
         Inicializa o gerenciador, localizando o arquivo settings.ini usando resource_path.
@@ -68,23 +74,56 @@ class SettingsManager:
         # --- FIM DA MUDANÇA 2 ---
         logging.info(f"[SettingsManager] Gerenciador de configurações apontando para: {self.config_path}")
 
+        # Cache em memória do settings.ini, invalidado pelo mtime do arquivo.
+        self._config: configparser.ConfigParser | None = None
+        self._mtime: float | None = None
+        self._settings_cache: Dict[str, Any] | None = None
+
+    def _get_config(self) -> configparser.ConfigParser | None:
+        """
+        Retorna o ConfigParser do settings.ini, relendo o arquivo apenas se o
+        seu mtime mudou desde a última leitura. Retorna None se não existir.
+        """
+        try:
+            mtime = os.stat(self.config_path).st_mtime
+        except FileNotFoundError:
+            self._config = self._mtime = self._settings_cache = None
+            return None
+
+        if self._config is None or mtime != self._mtime:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            config = configparser.ConfigParser()
+            config.read_string(content, source=self.config_path)
+            self._config, self._mtime, self._settings_cache = config, mtime, None
+
+        return self._config
+
     def load_settings(self) -> Dict[str, Any]:
         """
         Lê o arquivo .ini e o converte para um dicionário simples (flat).
-        (Lógica original mantida)
+        O resultado fica em cache até o arquivo ser modificado.
         """
-        config = configparser.ConfigParser()
-        if not os.path.exists(self.config_path):
+        config = self._get_config()
+        if config is None:
             logging.error(f"Arquivo de configuração não encontrado em {self.config_path}")
             return {}
 
-        config.read(self.config_path, encoding='utf-8')
+        if self._settings_cache is None:
+            self._settings_cache = self._build_settings_dict(config)
+        return dict(self._settings_cache)
 
+    def _build_settings_dict(self, config: configparser.ConfigParser) -> Dict[str, Any]:
+        """Converte o ConfigParser para o dicionário simples (flat) usado pela UI."""
         settings_dict = {}
         # Mapeamento pode precisar de ajuste fino baseado no conteúdo real do settings.ini e o que a UI envia
-        for key, section in self._KEY_TO_SECTION_MAP.items():
-            if config.has_section(section) and config.has_option(section, key):
-                settings_dict[key] = config.get(section, key)
+        for section, keys in self._SECTION_TO_KEYS.items():
+            if section not in config:
+                continue
+            sec = config[section]
+            for key in keys:
+                if key in sec:
+                    settings_dict[key] = sec[key]
 
         # Adiciona chaves booleanas se necessário (exemplo mantido do original)
         if config.has_section('LOGGING') and config.has_option('LOGGING', 'log_step_progress'):
@@ -99,15 +138,14 @@ class SettingsManager:
     def save_settings(self, new_settings: Dict[str, Any]):
         """
         Atualiza e salva o arquivo .ini com os novos valores.
-        (Lógica original mantida, usa self.config_path que agora é calculado com resource_path)
+        Altera o ConfigParser em cache e grava de forma atômica (arquivo
+        temporário + os.replace).
         """
-        config = configparser.ConfigParser()
-        if not os.path.exists(self.config_path):
+        config = self._get_config()
+        if config is None:
             logging.error(f"Arquivo de configuração não encontrado. Não é possível salvar.")
             return
 
-        config.read(self.config_path, encoding='utf-8')
-
         for key, value in new_settings.items():
             if key in self._KEY_TO_SECTION_MAP:
                 section = self._KEY_TO_SECTION_MAP[key]
@@ -120,9 +158,15 @@ class SettingsManager:
                 else:
                      config.set(section, key, str(value)) # Converte tudo para string para salvar
 
+        tmp_path = self.config_path + ".tmp"
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as configfile:
+            with open(tmp_path, 'w', encoding='utf-8') as configfile:
                 config.write(configfile)
+            os.replace(tmp_path, self.config_path)
+            self._mtime = os.stat(self.config_path).st_mtime
+            self._settings_cache = None
             logging.info(f"Configurações salvas com sucesso em {self.config_path}")
         except IOError as e:
+            # O ConfigParser em cache já foi alterado; força uma releitura do disco.
+            self._config = self._mtime = self._settings_cache = None
             logging.error(f"Falha ao escrever no arquivo de configuração: {e}")
\ No newline at end of file
@@ -19,10 +19,12 @@
 # Date: 03 de Outubro de 2025
 
 import logging
+import threading
 import time
 import sys
 from multiprocessing import Queue
-from typing import TYPE_CHECKING
+from queue import Full
+from typing import TYPE_CHECKING, Optional
 
 # Adiciona o diretório 'src' ao path para permitir importações absolutas
 import os
@@ -39,25 +41,58 @@ FAILSAFE_COMMAND = {
     "value": "0"
 }
 
-def run_watchdog(command_queue: Queue, locale_manager: 'LocaleManagerBackend'):
+# Lote enviado a cada batimento, montado uma única vez na importação. O
+# conteúdo nunca muda, então não há por que alocar uma lista nova por envio.
+FAILSAFE_BATCH = [FAILSAFE_COMMAND]
+
+# Capacidade da fila de comandos do Watchdog (criada pelo orquestrador).
+# O Controlador só aplica o lote mais recente, então um lote pendente basta.
+WATCHDOG_QUEUE_SIZE = 1
+
+# Intervalo entre envios do comando de segurança (segundos).
+HEARTBEAT_INTERVAL = 1.0
+# Pausa após um erro no loop antes de tentar de novo (segundos).
+ERROR_BACKOFF = 5.0
+
+def run_watchdog(command_queue: Queue, locale_manager: 'LocaleManagerBackend',
+                 stop_event: Optional['threading.Event'] = None):
     """
     O ponto de entrada para o processo do Watchdog.
+
+    Args:
+        command_queue (Queue): Fila de comandos lida pelo Controlador Central.
+        locale_manager (LocaleManagerBackend): Gerenciador de traduções.
+        stop_event (multiprocessing.Event, opcional): Quando sinalizado, encerra
+            o loop imediatamente, sem esperar o fim do intervalo atual.
     """
     lm = locale_manager
     logging.basicConfig(level=logging.INFO, format='%(asctime)s [WATCHDOG] [%(levelname)s] - %(message)s')
     logging.info(lm.get_string("watchdog.run.process_started"))
 
-    while True:
+    if stop_event is None:
+        stop_event = threading.Event()
+
+    # Agenda com relógio monotônico para não acumular desvio entre os envios.
+    next_tick = time.monotonic()
+    while not stop_event.is_set():
         try:
-            command_queue.put([FAILSAFE_COMMAND])
-            time.sleep(1)
+            # O Controlador só aplica o lote mais recente. Se o anterior ainda não
+            # foi consumido (ex: SUMO ainda conectando), a fila limitada recusa
+            # o novo lote sem bloquear: o pendente já tem o mesmo conteúdo.
+            try:
+                command_queue.put_nowait(FAILSAFE_BATCH)
+            except Full:
+                pass
+            next_tick = max(next_tick + HEARTBEAT_INTERVAL, time.monotonic())
+            stop_event.wait(max(0.0, next_tick - time.monotonic()))
 
         except (KeyboardInterrupt, SystemExit):
             logging.info(lm.get_string("watchdog.run.shutdown_signal"))
             break
         except Exception as e:
             logging.error(lm.get_string("watchdog.run.loop_error", error=e), exc_info=True)
-            time.sleep(5)
+            stop_event.wait(ERROR_BACKOFF)
+            next_tick = time.monotonic()
     
     logging.info(lm.get_string("watchdog.run.process_finished"))
 
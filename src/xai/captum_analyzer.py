@@ -25,6 +25,7 @@ import matplotlib.pyplot as plt
 import os
 import logging
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from captum.attr import IntegratedGradients
 
@@ -33,6 +34,11 @@ from agents.local_agent import LocalAgent
 
 plt.switch_backend('Agg')
 
+# Barras de progresso do relatório textual: só existem BAR_LENGTH + 1 variações,
+# então todas são montadas uma única vez na importação.
+BAR_LENGTH = 20
+_BARS = tuple('█' * i + '─' * (BAR_LENGTH - i) for i in range(BAR_LENGTH + 1))
+
 class CaptumModelWrapper(nn.Module):
     def __init__(self, model):
         super(CaptumModelWrapper, self).__init__()
@@ -42,20 +48,70 @@ class CaptumModelWrapper(nn.Module):
         return self.model(x)[0]
 
 class CaptumAnalyzer:
+    # Thread única, compartilhada por todas as instâncias, para gravar os
+    # relatórios fora do caminho crítico da atribuição.
+    _io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xai_report_io")
+
     def __init__(self, agent: LocalAgent, scenario_results_dir: str, locale_manager: LocaleManagerBackend):
         self.agent = agent
         self.locale_manager = locale_manager
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.wrapped_model = CaptumModelWrapper(self.agent.policy_net).to(self.device)
         self.ig = IntegratedGradients(self.wrapped_model)
+        # Na GPU, os passes da atribuição rodam em precisão reduzida (autocast):
+        # para ranquear features, BF16/FP16 dá a mesma ordenação que FP32.
+        self.autocast_dtype = self._select_autocast_dtype()
+        # Buffer de host (pinned quando há GPU) reutilizado para montar o lote de estados.
+        self._batch_buf: torch.Tensor | None = None
+        # Gravação pendente do último relatório (ver generate_analysis).
+        self.report_future: Future | None = None
         
         self.output_dir = os.path.join(scenario_results_dir, "captum", "reports")
         os.makedirs(self.output_dir, exist_ok=True)
+        self._set_report_paths()
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.output_path_png = os.path.join(self.output_dir, f"xai_report_{agent.id}_{timestamp}.png")
-        self.output_path_txt = os.path.join(self.output_dir, f"xai_report_{agent.id}_{timestamp}.txt")
-        
+    def _set_report_paths(self):
+        """
+        Define os caminhos do próximo relatório. Chamado a cada análise, pois a
+        mesma instância pode ser reutilizada para vários pedidos.
+        """
+        # Um único instante para o nome dos arquivos e o cabeçalho do relatório,
+        # para que ambos mostrem sempre o mesmo horário.
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        self.report_timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+        self.output_path_png = os.path.join(self.output_dir, f"xai_report_{self.agent.id}_{timestamp}.png")
+        self.output_path_txt = os.path.join(self.output_dir, f"xai_report_{self.agent.id}_{timestamp}.txt")
+
+    def _select_autocast_dtype(self) -> torch.dtype | None:
+        """
+        BF16 em GPUs que o suportam (Ampere+), FP16 nas demais GPUs (como no
+        treino do LocalAgent). Na CPU mantém FP32: a quantização int8 não serve
+        ao Integrated Gradients, que precisa de gradientes em ponto flutuante.
+        """
+        if self.device.type != "cuda":
+            return None
+        return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+
+    def _stage_states(self, experiences) -> torch.Tensor:
+        """
+        Copia os estados das experiências para um único buffer pré-alocado
+        [batch, seq, features] e o envia ao dispositivo em uma só transferência.
+        """
+        states = [exp.state for exp in experiences]
+        n = len(states)
+        state_shape = tuple(np.shape(states[0]))
+
+        buf = self._batch_buf
+        if buf is None or buf.shape[0] < n or tuple(buf.shape[1:]) != state_shape:
+            capacity = max(n, self.agent.xai_memory.memory.maxlen or 0)
+            buf = torch.empty((capacity, *state_shape), dtype=torch.float32,
+                              pin_memory=self.device.type == "cuda")
+            self._batch_buf = buf
+
+        np.stack(states, out=buf.numpy()[:n])
+        return buf[:n].to(self.device, non_blocking=True)
+
     def _get_feature_glossary(self) -> dict:
         # Esta função seria preenchida com a lógica para obter o glossário
         # a partir do state_extractor, como visto em outros ficheiros.
@@ -73,48 +129,55 @@ class CaptumAnalyzer:
                 logging.warning(lm.get_string("captum_analyzer.run.empty_memory_warning", agent_id=self.agent.id))
                 return None
 
-            # A lógica de análise do Captum permanece a mesma...
-            input_tensors = torch.cat([exp.state for exp in recent_experiences]).to(self.device)
+            # A primeira análise usa os caminhos definidos no construtor.
+            if self.report_future is not None:
+                self._set_report_paths()
+
+            # O baseline é criado já no dispositivo, sem cópia host -> GPU.
+            input_tensors = self._stage_states(recent_experiences)
             baselines = torch.zeros_like(input_tensors)
-            attributions, _ = self.ig.attribute(input_tensors, baselines, target=0, return_convergence_delta=True)
-            attributions = attributions.sum(dim=0).abs()
-            attributions = attributions / torch.norm(attributions)
-            importances = attributions.cpu().detach().numpy()
-            
+            # Só a atribuição precisa de autograd; enable_grad garante isso mesmo
+            # que o chamador esteja sob no_grad.
+            with torch.enable_grad(), torch.autocast(device_type=self.device.type, dtype=self.autocast_dtype,
+                                                     enabled=self.autocast_dtype is not None):
+                attributions, _ = self.ig.attribute(input_tensors, baselines, target=0, return_convergence_delta=True)
+
+            # Pós-processamento inteiramente no dispositivo e sem registro de autograd:
+            # normalização e ordenação em torch, com uma única transferência para a CPU.
+            with torch.inference_mode():
+                # Soma sobre o lote e os passos de tempo: uma importância por feature.
+                attributions = attributions.detach().float().reshape(-1, attributions.shape[-1]).sum(dim=0).abs()
+                importances = attributions / torch.norm(attributions)
+                total_importance = importances.sum()
+                normalized = torch.where(total_importance > 0, importances / total_importance.clamp_min(1e-12), torch.zeros_like(importances))
+                order = torch.argsort(importances, descending=True, stable=True)
+                importances_host, normalized_host = torch.stack([importances[order], normalized[order]]).cpu().tolist()
+                order_host = order.cpu().tolist()
+
+            # Em Python resta apenas a junção com o glossário. O dict padrão só é
+            # montado para features ausentes, não a cada iteração.
             feature_glossary = self._get_feature_glossary()
-            analysis_data = []
-            for i, importance in enumerate(importances):
-                feature_info = feature_glossary.get(i, {"name": f"Feature Desconhecida {i}", "description": "N/A"})
-                analysis_data.append({"name": feature_info["name"], "importance": importance, "description": feature_info["description"]})
-
-            total_importance = sum(item['importance'] for item in analysis_data)
-            for item in analysis_data:
-                item['normalized_importance'] = (item['importance'] / total_importance) if total_importance > 0 else 0
-            
-            sorted_analysis = sorted(analysis_data, key=lambda x: x['importance'], reverse=True)
-
-            # A geração do gráfico permanece a mesma...
-            # plt.savefig(self.output_path_png, ...)
-
-            with open(self.output_path_txt, "w", encoding="utf-8") as f:
-                f.write("=" * 60 + "\n")
-                f.write(lm.get_string("xai_report.title", agent_id=self.agent.id) + "\n")
-                f.write(lm.get_string("xai_report.subtitle", timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S")) + "\n")
-                f.write("=" * 60 + "\n\n")
-                f.write(lm.get_string("xai_report.header_description") + "\n\n")
-
-                for item in sorted_analysis:
-                    bar_length = 20
-                    filled_length = int(item['normalized_importance'] * bar_length)
-                    bar = '█' * filled_length + '─' * (bar_length - filled_length)
-                    
-                    f.write(f"● {lm.get_string('xai_report.section_sensor')}: {item['name']}\n")
-                    f.write(f"  {lm.get_string('xai_report.section_importance')}: {bar} ({item['importance']:.3f})\n")
-                    f.write(f"  {lm.get_string('xai_report.section_description')}: {item['description']}\n")
-                    f.write("-" * 60 + "\n")
-            
-            # --- MUDANÇA 2 ---
-            logging.info(lm.get_string("captum_analyzer.run.text_report_success", path=self.output_path_txt))
+            glossary_get = feature_glossary.get
+            sorted_analysis = []
+            append = sorted_analysis.append
+            for i, importance, normalized_importance in zip(order_host, importances_host, normalized_host):
+                feature_info = glossary_get(i)
+                if feature_info is None:
+                    name, description = f"Feature Desconhecida {i}", "N/A"
+                else:
+                    name, description = feature_info["name"], feature_info["description"]
+                append({
+                    "name": name,
+                    "importance": importance,
+                    "description": description,
+                    "normalized_importance": normalized_importance
+                })
+
+            # A gravação (texto e, futuramente, o gráfico) segue em segundo plano.
+            # Quem precisar dos arquivos no disco deve aguardar self.report_future.
+            self.report_future = self._io_pool.submit(
+                self._write_report, sorted_analysis, self.output_path_txt, self.report_timestamp
+            )
 
             return {
                 "image_path": os.path.abspath(self.output_path_png),
@@ -126,4 +189,44 @@ class CaptumAnalyzer:
             logging.error(lm.get_string("captum_analyzer.run.analysis_error", error=e), exc_info=True)
             return None
         finally:
-            if original_mode_is_training: self.agent.policy_net.train()
\ No newline at end of file
+            if original_mode_is_training: self.agent.policy_net.train()
+
+    def _write_report(self, sorted_analysis: list, output_path_txt: str, report_timestamp: str):
+        """
+        Grava o relatório textual em disco. Executado na thread de I/O;
+        exceções são registradas e propagadas para o Future. Os caminhos chegam
+        por argumento porque a instância pode já estar atendendo outro pedido.
+        """
+        lm = self.locale_manager
+        # A geração do gráfico permanece a mesma...
+        # plt.savefig(self.output_path_png, ...)
+        try:
+            # Monta o relatório em memória e grava com uma única escrita.
+            # Os rótulos das seções são traduzidos uma vez, fora do loop.
+            label_sensor = lm.get_string('xai_report.section_sensor')
+            label_importance = lm.get_string('xai_report.section_importance')
+            label_description = lm.get_string('xai_report.section_description')
+            separator = "-" * 60 + "\n"
+
+            lines = [
+                "=" * 60 + "\n",
+                lm.get_string("xai_report.title", agent_id=self.agent.id) + "\n",
+                lm.get_string("xai_report.subtitle", timestamp=report_timestamp) + "\n",
+                "=" * 60 + "\n\n",
+                lm.get_string("xai_report.header_description") + "\n\n",
+            ]
+            for item in sorted_analysis:
+                bar = _BARS[int(item['normalized_importance'] * BAR_LENGTH)]
+
+                lines.append(f"● {label_sensor}: {item['name']}\n")
+                lines.append(f"  {label_importance}: {bar} ({item['importance']:.3f})\n")
+                lines.append(f"  {label_description}: {item['description']}\n")
+                lines.append(separator)
+
+            with open(output_path_txt, "w", encoding="utf-8") as f:
+                f.write("".join(lines))
+
+            logging.info(lm.get_string("captum_analyzer.run.text_report_success", path=output_path_txt))
+        except Exception as e:
+            logging.error(lm.get_string("captum_analyzer.run.analysis_error", error=e), exc_info=True)
+            raise
\ No newline at end of file
@@ -31,11 +31,26 @@ import os
 import json
 import threading
 import time
+
+# No Linux, os pedidos são detectados por eventos do kernel (inotify) em vez de
+# varrer a pasta a cada ciclo. É opcional: sem ele, mantemos a varredura.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from xai.captum_analyzer import CaptumAnalyzer
+from xai.xai_worker import write_response_file, XAI_QUEUE_DIRNAME, REQUEST_SUFFIX, RESPONSE_SUFFIX
 from engine.environment import SumoEnvironment
 from core.population_manager import PopulationManager
 from core.lifecycle_manager import LifecycleManager
 from core.strategic_coordinator import StrategicCoordinator
+from utils.locale_manager_backend import LocaleManagerBackend
 
 class XaiWatcher:
     """
@@ -43,13 +58,25 @@ class XaiWatcher:
     um arquivo de resposta.
     """
     def __init__(self, population_manager: PopulationManager, lifecycle_manager: LifecycleManager, 
-                 env: SumoEnvironment, strategic_coordinator: StrategicCoordinator):
+                 env: SumoEnvironment, strategic_coordinator: StrategicCoordinator,
+                 locale_manager: LocaleManagerBackend):
         self.population_manager = population_manager
         self.lifecycle_manager = lifecycle_manager
         self.env = env
         self.strategic_coordinator = strategic_coordinator
+        self.locale_manager = locale_manager
         self.watcher_thread = None
         self.watcher_running = False
+        self._inotify = None
+        self._watch_descriptor = None
+        self._watched_dir = None
+        # Pastas derivadas do checkpoint do cenário, recalculadas só quando ele muda.
+        self._cached_checkpoint_dir = None
+        self._scenario_results_dir = None
+        self._queue_dir = None
+        # agent_id -> (agente, analisador). A entrada é descartada se o
+        # PopulationManager trocar o objeto do agente (nova geração).
+        self._analyzer_cache: dict[str, tuple[object, CaptumAnalyzer]] = {}
 
     def start(self):
         self.watcher_running = True
@@ -59,6 +86,72 @@ class XaiWatcher:
     def stop(self):
         self.watcher_running = False
 
+    def _refresh_dirs(self, checkpoint_dir: str):
+        """Recalcula (e cria) a pasta de pedidos/respostas se o cenário mudou."""
+        if checkpoint_dir == self._cached_checkpoint_dir:
+            return
+        scenario_results_dir = os.path.dirname(checkpoint_dir)
+        queue_dir = os.path.join(scenario_results_dir, "captum", XAI_QUEUE_DIRNAME)
+        os.makedirs(queue_dir, exist_ok=True)
+        self._scenario_results_dir = scenario_results_dir
+        self._queue_dir = queue_dir
+        self._cached_checkpoint_dir = checkpoint_dir
+        self._analyzer_cache.clear()
+
+    def _watch_queue_dir(self, queue_dir: str) -> bool:
+        """
+        Garante que o inotify está registrado na pasta de pedidos/respostas atual.
+        Retorna True quando a pasta acabou de ser (re)registrada, caso em que
+        os pedidos já existentes precisam de uma varredura inicial.
+        """
+        if queue_dir == self._watched_dir:
+            return False
+        if self._inotify is None:
+            self._inotify = INotify()
+        elif self._watch_descriptor is not None:
+            try:
+                self._inotify.rm_watch(self._watch_descriptor)
+            except OSError:
+                pass
+        self._watch_descriptor = self._inotify.add_watch(queue_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+        self._watched_dir = queue_dir
+        return True
+
+    def _pending_requests(self, queue_dir: str) -> list:
+        """
+        Retorna os nomes dos arquivos de pedido a processar. Com inotify, bloqueia
+        até chegar um evento (ou 2s, para reavaliar o estado); sem ele, varre a pasta.
+        """
+        if INotify is None:
+            return os.listdir(queue_dir)
+        if self._watch_queue_dir(queue_dir):
+            return os.listdir(queue_dir)
+        names = {}
+        for event in self._inotify.read(timeout=2000):
+            if event.mask & inotify_flags.IGNORED:
+                # A pasta foi removida: ela é recriada e registrada no próximo ciclo.
+                self._watched_dir = self._watch_descriptor = None
+                self._cached_checkpoint_dir = None
+            elif event.name:
+                names[event.name] = None
+        return list(names)
+
+    def _get_analyzer(self, agent_id: str, agent, scenario_results_dir: str) -> CaptumAnalyzer:
+        """Retorna o analisador do agente, reaproveitado enquanto o agente for o mesmo objeto."""
+        cached = self._analyzer_cache.get(agent_id)
+        if cached is not None and cached[0] is agent:
+            return cached[1]
+        analyzer = CaptumAnalyzer(agent, scenario_results_dir, self.locale_manager)
+        self._analyzer_cache[agent_id] = (agent, analyzer)
+        return analyzer
+
+    @staticmethod
+    def _read_request(request_path: str) -> dict:
+        """Lê e decodifica um arquivo de pedido (orjson, se disponível)."""
+        with open(request_path, "rb") as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
     def _watcher_loop(self):
         logging.info("[XAI_WATCHER] Vigilante de análise XAI iniciado.")
         while self.watcher_running:
@@ -67,80 +160,82 @@ class XaiWatcher:
                     time.sleep(5)
                     continue
                 
-                scenario_results_dir = os.path.dirname(self.lifecycle_manager.scenario_checkpoint_dir)
-                base_dir = os.path.join(scenario_results_dir, "captum")
-                requests_dir = os.path.join(base_dir, "requests")
-                responses_dir = os.path.join(base_dir, "responses")
-                os.makedirs(requests_dir, exist_ok=True)
-                os.makedirs(responses_dir, exist_ok=True)
+                self._refresh_dirs(self.lifecycle_manager.scenario_checkpoint_dir)
+                scenario_results_dir = self._scenario_results_dir
+                queue_dir = self._queue_dir
                 
-                for request_filename in os.listdir(requests_dir):
-                    if not request_filename.endswith(".request"): continue
+                processed_any = False
+                for request_filename in self._pending_requests(queue_dir):
+                    if not request_filename.endswith(REQUEST_SUFFIX): continue
+                    processed_any = True
 
-                    request_path = os.path.join(requests_dir, request_filename)
-                    response_filename = request_filename.replace(".request", ".response")
-                    response_path = os.path.join(responses_dir, response_filename)
-                    response_tmp_path = response_path + ".tmp"
+                    request_path = os.path.join(queue_dir, request_filename)
+                    response_filename = request_filename[:-len(REQUEST_SUFFIX)] + RESPONSE_SUFFIX
+                    response_path = os.path.join(queue_dir, response_filename)
                     response_data = {}
 
+                    # Fase de leitura: um pedido malformado é reportado como tal,
+                    # separado das falhas da análise em si.
+                    logging.info(f"[XAI_WATCHER] Pedido '{request_filename}' detectado. Processando...")
                     try:
-                        logging.info(f"[XAI_WATCHER] Pedido '{request_filename}' detectado. Processando...")
-                        with open(request_path, "r", encoding="utf-8") as f:
-                            request_data = json.load(f)
-                        
-                        agent_id = request_data.get("agent_id")
-                        agent = self.population_manager.agents.get(agent_id)
-
-                        if agent and self.env.state_extractor and self.strategic_coordinator:
-                            full_glossary = self.env.state_extractor.get_local_feature_glossary(agent_id)
-                            max_local_dim = self.strategic_coordinator.max_state_dim
-                            padding_needed = max_local_dim - len(full_glossary)
-                            for i in range(padding_needed):
-                                full_glossary.append({
-                                    "feature_name": f"Padding (Índice {i})",
-                                    "description": "Preenchimento para uniformizar o tamanho da entrada. Não é um sensor real."
-                                })
-                            gat_dim = self.strategic_coordinator.output_dim
-                            for i in range(gat_dim):
-                                full_glossary.append({
-                                    "feature_name": f"Vetor Estratégico (Comp. {i+1})",
-                                    "description": f"Componente nº {i+1} da orientação estratégica, resumindo o estado de tráfego vizinho."
-                                })
-                            
-                            analyzer = CaptumAnalyzer(agent, scenario_results_dir)
-                            # O método agora precisa do glossário completo
-                            analysis_result = analyzer.run_analysis(full_glossary=full_glossary)
+                        request_data = self._read_request(request_path)
+                    except (OSError, ValueError) as e:
+                        logging.error(f"[XAI_WATCHER] Pedido '{request_filename}' inválido: {e}")
+                        request_data = None
+                        response_data = {"status": "error", "message": f"Pedido inválido: {e}"}
+
+                    try:
+                        if request_data is not None:
+                            agent_id = request_data.get("agent_id")
+                            agent = self.population_manager.agents.get(agent_id)
+
+                            if agent and self.env.state_extractor and self.strategic_coordinator:
+                                analyzer = self._get_analyzer(agent_id, agent, scenario_results_dir)
+                                analysis_result = analyzer.generate_analysis()
                             
-                            # --- MUDANÇA PRINCIPAL AQUI ---
-                            # Verifica se o resultado é um dicionário (sucesso)
-                            if analysis_result:
-                                response_data = {
-                                    "status": "complete", 
-                                    "image_path": analysis_result.get("image_path"),
-                                    "text_path": analysis_result.get("text_path") # Adiciona o novo caminho
-                                }
+                                # --- MUDANÇA PRINCIPAL AQUI ---
+                                # Verifica se o resultado é um dicionário (sucesso).
+                                # O relatório é gravado em segundo plano: a resposta
+                                # "complete" só sai com os arquivos já no disco.
+                                report_future = analyzer.report_future if analysis_result else None
+                                if report_future is not None and report_future.exception() is not None:
+                                    response_data = {"status": "error", "message": "Falha ao gerar arquivos de análise. Verifique os logs do back-end."}
+                                elif analysis_result:
+                                    response_data = {
+                                        "status": "complete", 
+                                        "image_path": analysis_result.get("image_path"),
+                                        "text_path": analysis_result.get("text_path") # Adiciona o novo caminho
+                                    }
+                                else:
+                                    response_data = {"status": "error", "message": "Falha ao gerar arquivos de análise. Verifique os logs do back-end."}
                             else:
-                                response_data = {"status": "error", "message": "Falha ao gerar arquivos de análise. Verifique os logs do back-end."}
-                        else:
-                            response_data = {"status": "error", "message": f"Agente '{agent_id}' ou componentes essenciais não foram encontrados."}
+                                response_data = {"status": "error", "message": f"Agente '{agent_id}' ou componentes essenciais não foram encontrados."}
                     except Exception as e:
                         logging.error(f"[XAI_WATCHER] Erro ao processar pedido: {e}", exc_info=True)
                         response_data = {"status": "error", "message": str(e)}
                     
                     finally:
                         try:
-                            with open(response_tmp_path, "w", encoding="utf-8") as f:
-                                json.dump(response_data, f, indent=4)
-                            os.rename(response_tmp_path, response_path)
+                            write_response_file(response_path, response_data)
                         except Exception as e:
                             logging.error(f"[XAI_WATCHER] Falha crítica ao escrever arquivo de resposta atômica: {e}")
                         
-                        os.remove(request_path)
+                        # Resposta primeiro, pedido depois: a UI nunca vê a pasta sem nenhum dos dois.
+                        try:
+                            os.unlink(request_path)
+                        except FileNotFoundError:
+                            pass
                         logging.info(f"[XAI_WATCHER] Resposta para '{response_filename}' enviada.")
 
-                time.sleep(2)
+                # Com inotify, a espera já acontece no read() do kernel. Na varredura,
+                # só pausamos quando não havia pedidos: um lote é seguido de nova varredura.
+                if INotify is None and not processed_any:
+                    time.sleep(2)
             except Exception as e:
                 logging.error(f"[XAI_WATCHER] Erro crítico no loop do vigilante: {e}", exc_info=True)
                 time.sleep(10)
         
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = self._watch_descriptor = self._watched_dir = None
         logging.info("[XAI_WATCHER] Vigilante de análise XAI finalizado.")
\ No newline at end of file
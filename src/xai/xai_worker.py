@@ -23,9 +23,66 @@ import os
 import json
 import time
 import sys
+import queue
+import threading
 import configparser
+from collections import OrderedDict
 import torch
 
+# O orjson serializa direto para bytes e bem mais rápido que o json padrão.
+# É opcional: sem ele, usamos o json da biblioteca padrão.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Com inotify (Linux), novos pedidos chegam por eventos do kernel em vez de
+# varreduras periódicas da pasta. É opcional: sem ele, a pasta é varrida.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# Número máximo de agentes (e analisadores) mantidos carregados entre pedidos.
+AGENT_CACHE_SIZE = 16
+
+# Capacidade da fila de pedidos pendentes alimentada pelo inotify.
+REQUEST_QUEUE_SIZE = 256
+
+# Pedidos e respostas partilham uma única pasta (captum/queue), distinguidos
+# pelo sufixo: '<agent_id>.req' vira '<agent_id>.resp'.
+XAI_QUEUE_DIRNAME = "queue"
+REQUEST_SUFFIX = ".req"
+RESPONSE_SUFFIX = ".resp"
+
+def load_checkpoint_file(checkpoint_path: str) -> dict:
+    """
+    Desserializa um checkpoint na CPU com os tensores mapeados em memória (mmap),
+    sem copiá-los para a RAM de uma vez. weights_only fica desligado porque o
+    checkpoint carrega a ReplayMemory (memória XAI) serializada.
+    Versões antigas do PyTorch (< 2.1, sem 'mmap') ou arquivos no formato legado
+    caem na leitura convencional.
+    """
+    try:
+        return torch.load(checkpoint_path, map_location='cpu', weights_only=False, mmap=True)
+    except (TypeError, RuntimeError):
+        return torch.load(checkpoint_path, map_location=torch.device('cpu'))
+
+def write_response_file(response_path: str, response_data: dict):
+    """
+    Grava um arquivo de resposta de forma atômica: escreve em '.tmp' e troca
+    com os.replace, que (ao contrário de os.rename) também substitui um destino
+    existente no Windows. O JSON é compacto, pois só é lido pela UI.
+    """
+    response_tmp_path = response_path + ".tmp"
+    if orjson is not None:
+        payload = orjson.dumps(response_data)
+    else:
+        payload = json.dumps(response_data, separators=(',', ':')).encode("utf-8")
+    with open(response_tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(response_tmp_path, response_path)
+
 def run_xai_worker(
     settings: configparser.ConfigParser,
     scenario_results_dir: str
@@ -47,88 +104,250 @@ def run_xai_worker(
     os.makedirs(log_dir, exist_ok=True)
     setup_logging(log_dir=log_dir)
 
+    # O worker divide a máquina com a simulação e a UI: metade dos núcleos
+    # evita que as threads intra-op do PyTorch disputem a CPU com eles.
+    torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+
+    # O LocalAgent e o CaptumAnalyzer já escolhem a GPU quando ela existe; aqui
+    # só se decide uma vez o dispositivo da atribuição para o registro e para o
+    # cuDNN. As formas de entrada de cada agente se repetem entre pedidos, então
+    # o autotuning do cuDNN (LSTM) compensa a partir do segundo pedido.
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    if device.type == "cuda":
+        torch.backends.cudnn.benchmark = True
+    logging.info(f"[XAI_WORKER] Atribuições (Integrated Gradients) executadas em: {device}")
+
     captum_base_dir = os.path.join(scenario_results_dir, "captum")
-    requests_dir = os.path.join(captum_base_dir, "requests")
-    responses_dir = os.path.join(captum_base_dir, "responses")
-    os.makedirs(requests_dir, exist_ok=True)
-    os.makedirs(responses_dir, exist_ok=True)
+    queue_dir = os.path.join(captum_base_dir, XAI_QUEUE_DIRNAME)
+    os.makedirs(queue_dir, exist_ok=True)
 
     # --- MUDANÇAS APLICADAS A PARTIR DAQUI ---
     lm = LocaleManagerBackend()
 
-    logging.info(lm.get_string("xai_worker.run.start", path=requests_dir))
+    logging.info(lm.get_string("xai_worker.run.start", path=queue_dir))
+
+    # Modelos das mensagens usadas a cada pedido, resolvidos uma única vez:
+    # no loop resta só o str.format, sem a busca nas tabelas de tradução.
+    msg_request_received = lm.get_template("xai_worker.run.request_received")
+    msg_response_sent = lm.get_template("xai_worker.run.response_sent")
+    msg_response_file_error = lm.get_template("xai_worker.run.response_file_error")
+    msg_processing_error = lm.get_template("xai_worker.run.processing_error")
+    msg_analysis_failed = lm.get_template("xai_worker.run.analysis_failed")
+
+    def send_response(response_data: dict, response_path: str, response_filename: str, request_path: str | None = None):
+        """
+        Grava o arquivo de resposta e registra o envio. Se 'request_path' for
+        dado, o pedido só é apagado depois que a resposta já está no lugar.
+        """
+        try:
+            write_response_file(response_path, response_data)
+        except Exception as e:
+            logging.error(msg_response_file_error.format(error=e))
+        if request_path is not None:
+            try:
+                os.unlink(request_path)
+            except FileNotFoundError:
+                pass
+        logging.info(msg_response_sent.format(filename=response_filename))
+
+    def send_response_when_written(report_future, response_data: dict, response_path: str, response_filename: str):
+        """Callback do Future do relatório: só responde à UI com os arquivos já no disco."""
+        if report_future.exception() is not None:
+            response_data = {"status": "error", "message": msg_analysis_failed}
+        send_response(response_data, response_path, response_filename)
+
+    # Cache LRU: agent_id -> (mtime do checkpoint, analisador). Pedidos repetidos
+    # para o mesmo agente reaproveitam os pesos enquanto o checkpoint não mudar.
+    agent_cache: "OrderedDict[str, tuple[float, CaptumAnalyzer]]" = OrderedDict()
+
+    def get_analyzer(agent_id: str, checkpoint_path: str) -> "CaptumAnalyzer":
+        """Retorna o analisador do agente, carregando o checkpoint só se ele mudou."""
+        mtime = os.path.getmtime(checkpoint_path)
+        cached = agent_cache.get(agent_id)
+        if cached is not None and cached[0] == mtime:
+            agent_cache.move_to_end(agent_id)
+            return cached[1]
+
+        # A montagem do agente não precisa de autograd. Usa-se no_grad e não
+        # inference_mode: parâmetros criados sob inference_mode não poderiam
+        # participar do backward do Integrated Gradients depois.
+        with torch.no_grad():
+            checkpoint = load_checkpoint_file(checkpoint_path)
+            n_observations = checkpoint.get('n_observations')
+            if n_observations is None:
+                raise ValueError("Checkpoint does not contain 'n_observations'.")
+
+            agent = LocalAgent(
+                tlight_id=agent_id,
+                n_observations=n_observations,
+                n_actions=3,
+                initial_hyperparams={},
+                log_dir="",
+                locale_manager=lm 
+            )
+            # Reaproveita o checkpoint já carregado em vez de lê-lo de novo do disco.
+            agent.load_checkpoint(checkpoint_path, checkpoint=checkpoint)
+        
+        analyzer = CaptumAnalyzer(
+            agent=agent,
+            scenario_results_dir=scenario_results_dir,
+            locale_manager=lm
+        )
+
+        agent_cache[agent_id] = (mtime, analyzer)
+        agent_cache.move_to_end(agent_id)
+        if len(agent_cache) > AGENT_CACHE_SIZE:
+            agent_cache.popitem(last=False)
+        return analyzer
+
+    def process_request(request_filename: str):
+        """Atende um único pedido: analisa o agente e envia (ou agenda) a resposta."""
+        request_path = os.path.join(queue_dir, request_filename)
+        # O pedido é identificado só pelo nome: o conteúdo nem é lido.
+        agent_id = request_filename[:-len(REQUEST_SUFFIX)]
+        
+        response_filename = agent_id + RESPONSE_SUFFIX
+        response_path = os.path.join(queue_dir, response_filename)
+        report_future = None
+        
+        logging.info(msg_request_received.format(agent_id=agent_id))
+
+        try:
+            checkpoint_path = os.path.join(scenario_results_dir, "checkpoints", f"agent_{agent_id}.pth")
+            if not os.path.exists(checkpoint_path):
+                raise FileNotFoundError(f"Checkpoint file not found at {checkpoint_path}")
+
+            analyzer = get_analyzer(agent_id, checkpoint_path)
+        
+            analysis_result = analyzer.generate_analysis()
+        
+            if analysis_result:
+                response_data = {
+                    "status": "complete", 
+                    "image_path": analysis_result.get("image_path"),
+                    "text_path": analysis_result.get("text_path")
+                }
+                report_future = analyzer.report_future
+            else:
+                response_data = {"status": "error", "message": msg_analysis_failed}
+
+        except Exception as e:
+            logging.error(msg_processing_error.format(error=e), exc_info=True)
+            response_data = {"status": "error", "message": str(e)}
+        
+        finally:
+            if report_future is not None:
+                # O pedido sai da fila já (para não ser atendido de novo); a resposta
+                # espera a gravação do relatório enquanto o próximo pedido é analisado.
+                try:
+                    os.unlink(request_path)
+                except FileNotFoundError:
+                    pass
+                report_future.add_done_callback(
+                    lambda fut, data=response_data, path=response_path, name=response_filename:
+                        send_response_when_written(fut, data, path, name)
+                )
+            else:
+                # Resposta primeiro, pedido depois: a UI nunca vê a pasta sem nenhum dos dois.
+                send_response(response_data, response_path, response_filename, request_path)
+
+    # Fila de pedidos com prioridade para os mais recentes (menor -ctime primeiro).
+    # Com inotify, uma thread produtora alimenta a fila a partir dos eventos do
+    # kernel e o loop principal só bloqueia em get(), sem varrer a pasta.
+    request_queue: "queue.PriorityQueue[tuple[float, str]]" = queue.PriorityQueue(maxsize=REQUEST_QUEUE_SIZE)
+    queued_requests = set()
+    queued_lock = threading.Lock()
+
+    # Ligado enquanto a thread do inotify está de pé. Se ela falhar, o loop
+    # principal volta para a varredura periódica da pasta.
+    watcher_alive = threading.Event()
+
+    def enqueue_request(request_filename: str):
+        """
+        Põe o pedido na fila sem bloquear. Com a fila cheia, o pedido fica
+        de fora e é recolhido pela próxima varredura da pasta.
+        """
+        if not request_filename.endswith(REQUEST_SUFFIX):
+            return
+        with queued_lock:
+            if request_filename in queued_requests:
+                return
+            queued_requests.add(request_filename)
+        try:
+            ctime = os.stat(os.path.join(queue_dir, request_filename)).st_ctime
+        except FileNotFoundError:
+            with queued_lock:
+                queued_requests.discard(request_filename)
+            return
+        try:
+            request_queue.put_nowait((-ctime, request_filename))
+        except queue.Full:
+            with queued_lock:
+                queued_requests.discard(request_filename)
+
+    def rescan_requests():
+        for request_filename in os.listdir(queue_dir):
+            enqueue_request(request_filename)
+
+    def watch_requests(inotify):
+        try:
+            # Pedidos gravados antes do registro da watch entram por uma única varredura.
+            rescan_requests()
+            while True:
+                for event in inotify.read():
+                    enqueue_request(event.name)
+        except Exception as e:
+            logging.error(f"[XAI_WORKER] Falha na observação da pasta de pedidos (inotify); voltando à varredura periódica. Erro: {e}", exc_info=True)
+        finally:
+            watcher_alive.clear()
+            try:
+                inotify.close()
+            except Exception:
+                pass
+
+    if INotify is not None:
+        try:
+            inotify = INotify()
+            inotify.add_watch(queue_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+            watcher_alive.set()
+            threading.Thread(target=watch_requests, args=(inotify,), name="xai_request_watch", daemon=True).start()
+        except OSError as e:
+            logging.warning(f"[XAI_WORKER] inotify indisponível ({e}); usando varredura periódica da pasta de pedidos.")
 
     while True:
         try:
-            request_files = [f for f in os.listdir(requests_dir) if f.endswith(".request")]
+            if watcher_alive.is_set() or not request_queue.empty():
+                try:
+                    _, request_filename = request_queue.get(timeout=5)
+                except queue.Empty:
+                    # Rede de segurança: um evento perdido (ou um pedido que não
+                    # coube na fila) é recolhido por uma varredura a cada espera vazia.
+                    rescan_requests()
+                    continue
+                with queued_lock:
+                    queued_requests.discard(request_filename)
+                if os.path.exists(os.path.join(queue_dir, request_filename)):
+                    process_request(request_filename)
+                continue
+
+            # Sem inotify: varredura da pasta, atendendo os pedidos mais recentes primeiro.
+            request_files = []
+            for request_filename in os.listdir(queue_dir):
+                if not request_filename.endswith(REQUEST_SUFFIX): continue
+                try:
+                    request_files.append((os.stat(os.path.join(queue_dir, request_filename)).st_ctime, request_filename))
+                except FileNotFoundError:
+                    continue
             if not request_files:
                 time.sleep(2)
                 continue
 
-            for request_filename in request_files:
-                request_path = os.path.join(requests_dir, request_filename)
-                agent_id = request_filename.replace(".request", "")
-                
-                response_filename = f"{agent_id}.response"
-                response_path = os.path.join(responses_dir, response_filename)
-                response_tmp_path = response_path + ".tmp"
-                
-                logging.info(lm.get_string("xai_worker.run.request_received", agent_id=agent_id))
+            request_files.sort(reverse=True)
+            for _, request_filename in request_files:
+                process_request(request_filename)
 
-                try:
-                    checkpoint_path = os.path.join(scenario_results_dir, "checkpoints", f"agent_{agent_id}.pth")
-                    if not os.path.exists(checkpoint_path):
-                        raise FileNotFoundError(f"Checkpoint file not found at {checkpoint_path}")
-
-                    checkpoint = torch.load(checkpoint_path, map_location=torch.device('cpu'))
-                    n_observations = checkpoint.get('n_observations')
-                    if n_observations is None:
-                        raise ValueError("Checkpoint does not contain 'n_observations'.")
-
-                    agent = LocalAgent(
-                        tlight_id=agent_id,
-                        n_observations=n_observations,
-                        n_actions=3,
-                        initial_hyperparams={},
-                        log_dir="",
-                        locale_manager=lm 
-                    )
-                    agent.load_checkpoint(checkpoint_path)
-                    
-                    analyzer = CaptumAnalyzer(
-                        agent=agent,
-                        scenario_results_dir=scenario_results_dir,
-                        locale_manager=lm
-                    )
-                    
-                    analysis_result = analyzer.generate_analysis()
-                    
-                    if analysis_result:
-                        response_data = {
-                            "status": "complete", 
-                            "image_path": analysis_result.get("image_path"),
-                            "text_path": analysis_result.get("text_path")
-                        }
-                    else:
-                        response_data = {"status": "error", "message": lm.get_string("xai_worker.run.analysis_failed")}
-
-                except Exception as e:
-                    logging.error(lm.get_string("xai_worker.run.processing_error", error=e), exc_info=True)
-                    response_data = {"status": "error", "message": str(e)}
-                
-                finally:
-                    try:
-                        with open(response_tmp_path, "w", encoding="utf-8") as f:
-                            json.dump(response_data, f, indent=4)
-                        os.rename(response_tmp_path, response_path)
-                    except Exception as e:
-                        logging.error(lm.get_string("xai_worker.run.response_file_error", error=e))
-                    
-                    if os.path.exists(request_path):
-                        os.remove(request_path)
-                    logging.info(lm.get_string("xai_worker.run.response_sent", filename=response_filename))
-
-            time.sleep(2)
+            # Sem pausa após um lote: pedidos que chegaram durante as análises
+            # são atendidos na hora. A espera só ocorre com a pasta vazia.
 
         except (KeyboardInterrupt, SystemExit):
             break
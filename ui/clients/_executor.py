@@ -0,0 +1,42 @@
+# File: ui/clients/_executor.py (NOVO ARQUIVO)
+# Author: Gabriel Moraes
+# Date: 16 de Outubro de 2025
+
+"""
+Define o pool de threads de I/O compartilhado pelos clientes da UI.
+
+Em vez de cada ação da interface criar (e descartar) uma thread própria,
+o trabalho é enviado a dois ThreadPoolExecutor, que limitam o número de
+threads simultâneas:
+
+- submit_io: leituras curtas em disco (listas, mapas, arquivos de status).
+- submit_wait: tarefas que só aguardam um arquivo do back-end por até alguns
+  minutos (a resposta do XAI, o status.json). Ficam num pool próprio para
+  nunca ocuparem as threads das leituras curtas.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+# As threads dos pools só são criadas conforme a demanda.
+UI_IO_MAX_WORKERS = 8
+UI_WAIT_MAX_WORKERS = 4
+
+UI_IO_EXECUTOR = ThreadPoolExecutor(max_workers=UI_IO_MAX_WORKERS, thread_name_prefix="ui-io")
+UI_WAIT_EXECUTOR = ThreadPoolExecutor(max_workers=UI_WAIT_MAX_WORKERS, thread_name_prefix="ui-wait")
+
+def submit_io(fn: Callable, *args, **kwargs) -> Future:
+    """Envia uma tarefa de I/O curta ao pool compartilhado."""
+    return UI_IO_EXECUTOR.submit(fn, *args, **kwargs)
+
+def submit_wait(fn: Callable, *args, **kwargs) -> Future:
+    """Envia ao pool de esperas uma tarefa que bloqueia aguardando o back-end."""
+    return UI_WAIT_EXECUTOR.submit(fn, *args, **kwargs)
+
+def shutdown_io():
+    """
+    Encerra os pools ao sair da UI: tarefas ainda na fila são canceladas e as
+    que estão em execução não são aguardadas.
+    """
+    UI_IO_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    UI_WAIT_EXECUTOR.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
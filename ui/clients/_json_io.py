@@ -0,0 +1,30 @@
+# File: ui/clients/_json_io.py (NOVO ARQUIVO)
+# Author: Gabriel Moraes
+# Date: 16 de Outubro de 2025
+
+"""
+Leitura de JSON compartilhada pela UI (status.json, respostas do XAI, arquivos
+de tradução e as mensagens do back-end via WebSocket).
+
+O arquivo é lido inteiro como bytes, com uma única chamada, e decodificado
+pelo orjson quando ele está instalado. É opcional: sem ele, usamos o json da
+biblioteca padrão, que também aceita bytes UTF-8.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError é subclasse de json.JSONDecodeError: quem chama pode
+# tratar os erros de decodificação com 'except json.JSONDecodeError' nos dois casos.
+# Ambos aceitam str ou bytes.
+loads_json = orjson.loads if orjson is not None else json.loads
+
+def read_json(path: str) -> Any:
+    """Lê e decodifica o arquivo JSON em 'path'."""
+    with open(path, "rb") as f:
+        return loads_json(f.read())
\ No newline at end of file
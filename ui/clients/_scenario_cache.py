@@ -0,0 +1,69 @@
+# File: ui/clients/_scenario_cache.py (NOVO ARQUIVO)
+# Author: Gabriel Moraes
+# Date: 16 de Outubro de 2025
+
+"""
+Localiza a pasta de cenário mais recente em 'results', com memoização.
+
+Vários clientes da UI precisam desse mesmo caminho, às vezes muitas vezes
+seguidas (ex: as tentativas do PlanningMapLoader). O resultado da varredura
+é guardado por um curto intervalo (ttl) e partilhado entre todos eles.
+"""
+
+import os
+import threading
+import time
+
+# project_root -> (instante da varredura, mtime_ns de 'results', pasta do cenário ou None)
+_latest_scenario_cache: dict[str, tuple[float, int, str | None]] = {}
+_cache_lock = threading.Lock()
+
+IGNORED_DIRS = frozenset({"database"})
+
+def _scan_latest_scenario_dir(results_dir: str, ignored: frozenset[str] = IGNORED_DIRS) -> str | None:
+    """
+    Varre 'results' e retorna a subpasta modificada mais recentemente.
+
+    Uma única passada de os.scandir: o tipo de cada entrada vem junto com a
+    listagem (d_type), então is_dir(follow_symlinks=False) normalmente não faz
+    syscall, e o stat() de cada DirEntry fica em cache após a primeira chamada.
+    Links simbólicos para pastas não são considerados cenários.
+    """
+    try:
+        with os.scandir(results_dir) as it:
+            entries = [e for e in it if e.name not in ignored and e.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return None
+    if not entries: return None
+
+    latest = max(entries, key=lambda e: e.stat(follow_symlinks=False).st_mtime_ns)
+    return latest.path
+
+def get_latest_scenario_dir(project_root: str, ttl: float = 5.0) -> str | None:
+    """
+    Retorna o caminho absoluto da pasta de cenário mais recente.
+
+    O resultado é invalidado na hora quando o mtime de 'results' muda (um
+    cenário foi criado ou removido), ao custo de um único stat. O ttl só
+    limita quanto tempo se confia nele quando um cenário existente é alterado.
+
+    Args:
+        project_root: A raiz do projeto (que contém a pasta 'results').
+        ttl: Por quantos segundos um resultado anterior pode ser reutilizado.
+    """
+    results_dir = os.path.join(project_root, "results")
+    try:
+        parent_mtime_ns = os.stat(results_dir).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _latest_scenario_cache.get(project_root)
+    if cached is not None and cached[1] == parent_mtime_ns and now - cached[0] <= ttl:
+        return cached[2]
+
+    latest = _scan_latest_scenario_dir(results_dir)
+    with _cache_lock:
+        _latest_scenario_cache[project_root] = (now, parent_mtime_ns, latest)
+    return latest
\ No newline at end of file
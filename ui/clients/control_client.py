@@ -11,6 +11,7 @@ tempos) afetem a simulação de dados mock em tempo real.
 """
 
 import logging
+import threading
 from typing import TYPE_CHECKING
 
 # Usamos TYPE_CHECKING para evitar importação circular, uma boa prática
@@ -21,6 +22,10 @@ class ControlClient:
     """
     Traduz ações da UI em comandos e os envia para o backend.
     """
+    # Janela (em segundos) para agrupar mudanças de tempo em rajada, como ao
+    # arrastar um slider: só o último valor de cada semáforo é repassado.
+    TIMING_DEBOUNCE_SECONDS = 0.05
+
     def __init__(self, live_data_provider: 'LiveDataProvider' = None):
         """
         Inicializa o cliente de controle.
@@ -30,30 +35,36 @@ class ControlClient:
                                 para o feedback loop da UI.
         """
         self.live_data_provider = live_data_provider
+        self._pending: dict[str, tuple[float, float]] = {}
+        self._pending_lock = threading.Lock()
+        self._debounce_timer: threading.Timer | None = None
         logging.info("[ControlClient] Cliente de comando inicializado (Modo Stub).")
 
     def set_global_mode(self, mode: str):
         """
         Envia um comando para alterar o modo de operação global do sistema.
         """
-        print(f">>> [COMANDO UI]: Mudar modo global para '{mode.upper()}'")
-        logging.info(f"--- [CONTROL_CLIENT] ---> COMANDO ENVIADO: Mudar modo global para '{mode.upper()}'")
+        if __debug__:
+            print(f">>> [COMANDO UI]: Mudar modo global para '{mode.upper()}'")
+        logging.info("--- [CONTROL_CLIENT] ---> COMANDO ENVIADO: Mudar modo global para '%s'", mode.upper())
         pass
 
     def set_semaphore_override(self, semaphore_id: str, state: str):
         """
         Envia um comando para aplicar um override em um semáforo específico.
         """
-        print(f">>> [COMANDO UI]: Override no semáforo '{semaphore_id}' para o estado '{state.upper()}'")
-        logging.info(f"--- [CONTROL_CLIENT] ---> COMANDO ENVIADO: Aplicar override no semáforo '{semaphore_id}' para o estado '{state.upper()}'")
+        if __debug__:
+            print(f">>> [COMANDO UI]: Override no semáforo '{semaphore_id}' para o estado '{state.upper()}'")
+        logging.info("--- [CONTROL_CLIENT] ---> COMANDO ENVIADO: Aplicar override no semáforo '%s' para o estado '%s'", semaphore_id, state.upper())
         pass
         
     def set_semaphore_timings(self, semaphore_id: str, green_time: str, yellow_time: str):
         """
         Envia um comando para definir novos tempos de fase para um semáforo.
         """
-        print(f">>> [COMANDO UI]: Novos tempos para '{semaphore_id}': Verde={green_time}s, Amarelo={yellow_time}s")
-        logging.info(f"--- [CONTROL_CLIENT] ---> COMANDO ENVIADO: Novos tempos para '{semaphore_id}': Verde={green_time}s, Amarelo={yellow_time}s")
+        if __debug__:
+            print(f">>> [COMANDO UI]: Novos tempos para '{semaphore_id}': Verde={green_time}s, Amarelo={yellow_time}s")
+        logging.info("--- [CONTROL_CLIENT] ---> COMANDO ENVIADO: Novos tempos para '%s': Verde=%ss, Amarelo=%ss", semaphore_id, green_time, yellow_time)
         
         # --- FEEDBACK LOOP PARA O SIMULADOR DA UI ---
         if self.live_data_provider:
@@ -61,7 +72,31 @@ class ControlClient:
                 # Converte os tempos para float antes de enviar
                 gt_float = float(green_time)
                 yt_float = float(yellow_time)
-                self.live_data_provider.update_timing_override(semaphore_id, gt_float, yt_float)
             except (ValueError, TypeError):
-                logging.warning(f"[ControlClient] Valores de tempo inválidos recebidos: G={green_time}, Y={yellow_time}. Não foi possível atualizar o simulador.")
-        pass
\ No newline at end of file
+                logging.warning("[ControlClient] Valores de tempo inválidos recebidos: G=%s, Y=%s. Não foi possível atualizar o simulador.", green_time, yellow_time)
+                return
+
+            # O envio é adiado por uma janela curta; novas mudanças dentro dela
+            # substituem o valor pendente e reiniciam o temporizador.
+            with self._pending_lock:
+                self._pending[semaphore_id] = (gt_float, yt_float)
+                if self._debounce_timer is not None:
+                    self._debounce_timer.cancel()
+                self._debounce_timer = threading.Timer(self.TIMING_DEBOUNCE_SECONDS, self._flush_pending)
+                self._debounce_timer.daemon = True
+                self._debounce_timer.start()
+
+    def _flush_pending(self):
+        """Repassa ao LiveDataProvider o último tempo pedido para cada semáforo."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._debounce_timer = None
+
+        # O LiveDataProvider atual fala só com o backend real e não tem mais o
+        # simulador mock: sem o método, os tempos ficam apenas no log acima.
+        update_timing_override = getattr(self.live_data_provider, "update_timing_override", None)
+        if update_timing_override is None:
+            logging.debug("[ControlClient] LiveDataProvider sem update_timing_override; %d tempo(s) não repassado(s).", len(pending))
+            return
+        for semaphore_id, (gt_float, yt_float) in pending.items():
+            update_timing_override(semaphore_id, gt_float, yt_float)
\ No newline at end of file
@@ -12,9 +12,11 @@ thread, evitando que a busca por arquivos congele a interface do usuário.
 import os
 import json
 import logging
-import threading
 from typing import Callable
 
+from ui.clients._executor import submit_io
+from ui.clients._scenario_cache import get_latest_scenario_dir
+
 class InfrastructureClient:
     """
     Busca o status da análise de infraestrutura em uma thread separada.
@@ -33,25 +35,16 @@ class InfrastructureClient:
 
     def _find_latest_status_file(self) -> str | None:
         """Encontra o caminho absoluto para o arquivo analysis_status.json mais recente."""
-        # (A lógica interna deste método permanece a mesma)
         try:
-            results_dir = os.path.join(self.project_root, "results")
-            if not os.path.exists(results_dir): return None
-            
-            ignored_dirs = {"database"}
-            all_scenarios = [
-                d for d in os.listdir(results_dir) 
-                if os.path.isdir(os.path.join(results_dir, d)) and d not in ignored_dirs
-            ]
-            if not all_scenarios: return None
+            latest_scenario_dir = get_latest_scenario_dir(self.project_root)
+            if not latest_scenario_dir: return None
 
-            latest_scenario_name = max(all_scenarios, key=lambda d: os.path.getmtime(os.path.join(results_dir, d)))
             status_file = os.path.join(
-                results_dir, latest_scenario_name, "infrastructure_analysis", "analysis_status.json"
+                latest_scenario_dir, "infrastructure_analysis", "analysis_status.json"
             )
             return status_file if os.path.exists(status_file) else None
         except Exception as e:
-            logging.error(f"[INFRA_CLIENT] Erro ao procurar arquivo de status: {e}")
+            logging.error("[INFRA_CLIENT] Erro ao procurar arquivo de status: %s", e)
             return None
 
     # --- MUDANÇA 2: A lógica de busca agora está em um método alvo para a thread ---
@@ -82,8 +75,7 @@ class InfrastructureClient:
     # --- MUDANÇA 3: Novo método público para iniciar a busca ---
     def start_fetching_latest_analysis(self):
         """
-        Inicia a busca pelo arquivo de análise em uma nova thread.
+        Inicia a busca pelo arquivo de análise no pool de I/O compartilhado.
         Este método retorna imediatamente, sem bloquear a UI.
         """
-        thread = threading.Thread(target=self._fetch_thread_target, daemon=True)
-        thread.start()
\ No newline at end of file
+        submit_io(self._fetch_thread_target)
\ No newline at end of file
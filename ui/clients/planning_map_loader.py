@@ -12,10 +12,19 @@ sem bloquear a thread principal da UI.
 
 import logging
 import os
-import threading
 import time
 from typing import Callable
 
+from ui.clients._executor import submit_io
+from ui.clients._scenario_cache import get_latest_scenario_dir
+
+# No Linux, a espera pelo mapa é feita com inotify: uma única espera bloqueante
+# que acorda assim que o arquivo é gravado. Sem ele, a pasta é consultada.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
 class PlanningMapLoader:
     """
     Busca pelo arquivo de mapa de planejamento em uma thread separada.
@@ -31,42 +40,87 @@ class PlanningMapLoader:
         self.project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
         self.on_complete = on_complete_callback
 
+    def _find_latest_maps_dir(self) -> str | None:
+        """Retorna a pasta 'maps' do cenário mais recente (que pode ainda não existir)."""
+        latest_scenario_dir = get_latest_scenario_dir(self.project_root)
+        if not latest_scenario_dir: return None
+        return os.path.join(latest_scenario_dir, "maps")
+
     def _find_latest_map_image_path(self) -> str | None:
         """Busca o caminho esperado para a imagem de mapa mais recente."""
         try:
-            results_dir = os.path.join(self.project_root, "results")
-            if not os.path.exists(results_dir): return None
-            
-            ignored_dirs = {"database"}
-            all_scenarios = [d for d in os.listdir(results_dir) if os.path.isdir(os.path.join(results_dir, d)) and d not in ignored_dirs]
-            if not all_scenarios: return None
-            
-            latest_scenario_dir_name = max(all_scenarios, key=lambda d: os.path.getmtime(os.path.join(results_dir, d)))
-            maps_dir = os.path.join(results_dir, latest_scenario_dir_name, "maps")
+            maps_dir = self._find_latest_maps_dir()
+            if not maps_dir: return None
 
             planning_map_path = os.path.join(maps_dir, "map_planning.png")
             return planning_map_path if os.path.exists(planning_map_path) else None
                 
         except Exception as e:
-            logging.error(f"[PlanningMapLoader] Erro ao procurar imagem do mapa: {e}")
+            logging.error("[PlanningMapLoader] Erro ao procurar imagem do mapa: %s", e)
             return None
 
-    def _loader_thread_target(self):
+    def _wait_for_map_file(self, maps_dir: str, deadline: float) -> str | None:
         """
-        Alvo da thread: Procura pelo arquivo de mapa repetidamente e depois
-        chama o callback com o resultado.
+        Bloqueia (via inotify) até 'map_planning.png' ser gravado em 'maps_dir'
+        ou até o prazo. Lança OSError se o inotify não puder ser usado.
         """
-        logging.info("[PlanningMapLoader] Iniciando busca em segundo plano pelo mapa de planejamento...")
-        map_path = None
-        # Tenta por 60 segundos (20 tentativas com 3 segundos de intervalo)
-        for i in range(20):
+        os.makedirs(maps_dir, exist_ok=True)
+        planning_map_path = os.path.join(maps_dir, "map_planning.png")
+        with INotify() as inotify:
+            inotify.add_watch(maps_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+            # O arquivo pode ter surgido entre a primeira busca e o registro da watch.
+            if os.path.exists(planning_map_path):
+                return planning_map_path
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                for event in inotify.read(timeout=int(remaining * 1000)):
+                    if event.name == "map_planning.png":
+                        return planning_map_path
+
+    def _poll_for_map_file(self, deadline: float) -> str | None:
+        """Consulta a pasta até o prazo, com intervalo crescente de 0,25s até 3s."""
+        attempt = 0
+        delay = 0.25
+        while True:
+            attempt += 1
             path = self._find_latest_map_image_path()
             if path:
-                logging.info(f"[PlanningMapLoader] Mapa encontrado na tentativa {i+1}.")
-                map_path = path
-                break
-            time.sleep(3)
-        
+                logging.info("[PlanningMapLoader] Mapa encontrado na tentativa %d.", attempt)
+                return path
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 3)
+
+    def _loader_thread_target(self):
+        """
+        Alvo da thread: Procura pelo arquivo de mapa (aguardando até 60 segundos
+        que ele seja gerado) e depois chama o callback com o resultado.
+        """
+        logging.info("[PlanningMapLoader] Iniciando busca em segundo plano pelo mapa de planejamento...")
+        deadline = time.monotonic() + 60
+        map_path = self._find_latest_map_image_path()
+
+        if not map_path:
+            maps_dir = None
+            if INotify is not None:
+                try:
+                    maps_dir = self._find_latest_maps_dir()
+                except OSError:
+                    maps_dir = None
+            if maps_dir:
+                try:
+                    map_path = self._wait_for_map_file(maps_dir, deadline)
+                except OSError as e:
+                    # Ex: limite de watches do inotify atingido.
+                    logging.warning("[PlanningMapLoader] inotify indisponível (%s). Consultando a pasta periodicamente.", e)
+                    map_path = self._poll_for_map_file(deadline)
+            else:
+                map_path = self._poll_for_map_file(deadline)
+
         if not map_path:
             logging.warning("[PlanningMapLoader] Tempo de busca esgotado. Mapa de planejamento não foi encontrado.")
 
@@ -76,8 +130,7 @@ class PlanningMapLoader:
 
     def start_loading(self):
         """
-        Inicia a busca pelo arquivo de mapa em uma nova thread.
+        Inicia a busca pelo arquivo de mapa no pool de I/O compartilhado.
         Retorna imediatamente.
         """
-        thread = threading.Thread(target=self._loader_thread_target, daemon=True)
-        thread.start()
\ No newline at end of file
+        submit_io(self._loader_thread_target)
\ No newline at end of file
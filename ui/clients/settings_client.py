@@ -7,6 +7,7 @@ Define o SettingsClient, responsável por comunicar as alterações de
 configuração da UI para o backend.
 """
 
+import json
 import logging
 from typing import Dict, Any, TYPE_CHECKING
 
@@ -19,6 +20,8 @@ class SettingsClient:
     Envia comandos de atualização de configurações para o backend através
     do provedor de dados em tempo real (WebSocket).
     """
+    # O envelope do comando é fixo: só o payload é serializado a cada envio.
+    _SAVE_SETTINGS_PREFIX = '{"type":"save_settings","payload":'
     def __init__(self, live_data_provider: 'LiveDataProvider'):
         """
         Inicializa o cliente de configurações.
@@ -43,10 +46,7 @@ class SettingsClient:
             logging.error("[SettingsClient] LiveDataProvider não foi fornecido. Impossível enviar configurações.")
             return
 
-        command = {
-            "type": "save_settings",
-            "payload": settings_payload
-        }
+        command_json = self._SAVE_SETTINGS_PREFIX + json.dumps(settings_payload, separators=(',', ':')) + '}'
         
-        self.live_data_provider.send_command_to_backend(command)
-        logging.info(f"[SettingsClient] Comando 'save_settings' enviado para o backend com {len(settings_payload)} chaves.")
\ No newline at end of file
+        self.live_data_provider.send_command_to_backend(command_json)
+        logging.info("[SettingsClient] Comando 'save_settings' enviado para o backend com %d chaves.", len(settings_payload))
\ No newline at end of file
@@ -11,17 +11,51 @@ um período antes de desistir.
 """
 
 import os
-import json
+import sys
 import logging
 import threading
 import time
+from functools import lru_cache
+from pathlib import Path
 from typing import Callable, Dict, Any
 from datetime import datetime
 
+from ui.clients._executor import submit_wait
+from ui.clients._json_io import read_json
+from ui.clients._scenario_cache import get_latest_scenario_dir
+
+# Raiz do projeto, resolvida uma única vez na importação do módulo.
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+_RESULTS_DIR = os.path.join(_PROJECT_ROOT, "results")
+
+# No Linux, a espera pelo status.json é feita com inotify: o arquivo só é
+# procurado de novo quando o kernel avisa que algo mudou em 'results'.
+# É opcional: sem ele, a pasta é consultada a cada 3 segundos.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# Com inotify, a espera é fatiada neste intervalo para que stop() seja atendido logo.
+STOP_CHECK_INTERVAL = 0.5
+
+# A partir do Python 3.11, fromisoformat aceita o sufixo 'Z' diretamente.
+_ISO_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+@lru_cache(maxsize=16)
+def _format_timestamp(timestamp: str) -> str:
+    """Converte o 'last_updated' ISO 8601 para exibição. Memoizado por valor."""
+    if not _ISO_ACCEPTS_Z:
+        timestamp = timestamp.replace("Z", "+00:00")
+    return datetime.fromisoformat(timestamp).strftime("%d/%m/%Y %H:%M:%S")
+
 class SystemStatusClient:
     """
     Busca o status.json mais recente em uma thread separada.
     """
+    project_root = _PROJECT_ROOT
+    results_dir = _RESULTS_DIR
+
     def __init__(self, on_complete_callback: Callable[[Dict[str, Any]], None]):
         """
         Inicializa o cliente.
@@ -29,8 +63,13 @@ class SystemStatusClient:
         Args:
             on_complete_callback: A função que será chamada quando a busca terminar.
         """
-        self.project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
         self.on_complete = on_complete_callback
+        # Sinalizado por stop(): interrompe a espera pelo arquivo sem chamar o callback.
+        self._stop_evt = threading.Event()
+        # Último status.json lido: (caminho, st_mtime_ns) e o resultado montado.
+        # Enquanto o arquivo não muda, as buscas seguintes não o releem.
+        self._last_status_key: tuple[str, int] | None = None
+        self._last_status_result: Dict[str, Any] | None = None
 
     def _find_and_read_status_file(self) -> Dict[str, Any]:
         """
@@ -38,58 +77,107 @@ class SystemStatusClient:
         Se ocorrer um erro, retorna um dicionário de erro.
         """
         try:
-            results_dir = os.path.join(self.project_root, "results")
-            if not os.path.exists(results_dir) or not os.path.isdir(results_dir):
+            latest_scenario_dir = get_latest_scenario_dir(self.project_root)
+            if not latest_scenario_dir:
                 return {"status": "error", "message_key": "system_status_view.status_file_not_found"}
 
-            ignored_dirs = {"database"}
-            all_scenarios = [
-                d for d in os.listdir(results_dir)
-                if os.path.isdir(os.path.join(results_dir, d)) and d not in ignored_dirs
-            ]
-            if not all_scenarios:
-                return {"status": "error", "message_key": "system_status_view.status_file_not_found"}
-
-            latest_scenario_name = max(all_scenarios, key=lambda d: os.path.getmtime(os.path.join(results_dir, d)))
-            status_file_path = os.path.join(results_dir, latest_scenario_name, "status.json")
+            status_file_path = os.path.join(latest_scenario_dir, "status.json")
             
-            if not os.path.exists(status_file_path):
+            try:
+                status_key = (status_file_path, os.stat(status_file_path).st_mtime_ns)
+            except FileNotFoundError:
                 # Este não é mais um erro final, apenas uma tentativa falhada.
                 return {"status": "pending"}
+            if status_key == self._last_status_key:
+                return self._last_status_result
             
-            with open(status_file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(status_file_path)
             
             timestamp = data.get("last_updated", "N/A")
             if timestamp != "N/A":
-                dt_object = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                data["last_updated_formatted"] = dt_object.strftime("%d/%m/%Y %H:%M:%S")
+                data["last_updated_formatted"] = _format_timestamp(timestamp)
 
-            return {"status": "complete", "data": data}
+            result = {"status": "complete", "data": data}
+            self._last_status_key, self._last_status_result = status_key, result
+            return result
 
         except Exception as e:
-            logging.error(f"[SystemStatusClient] Erro ao buscar/ler status.json: {e}", exc_info=True)
+            logging.error("[SystemStatusClient] Erro ao buscar/ler status.json: %s", e, exc_info=True)
             return {"status": "error", "message_key": "system_status_view.status_file_error", "error_details": str(e)}
 
-    # --- MUDANÇA PRINCIPAL AQUI ---
-    def _fetch_thread_target(self):
-        """
-        Método alvo da thread: procura repetidamente pelo arquivo e chama o callback.
-        """
-        logging.info("[SystemStatusClient] Iniciando busca em loop pelo status.json...")
-        final_result = None
-        # Tenta por 60 segundos (20 tentativas com 3 segundos de intervalo)
-        for i in range(20):
+    def _poll_for_status_file(self, deadline: float) -> Dict[str, Any]:
+        """Procura o arquivo a cada 3 segundos até o prazo."""
+        attempt = 0
+        while True:
+            attempt += 1
             result = self._find_and_read_status_file()
-            final_result = result
             
             # Se encontrou o arquivo, para de procurar
             if result.get("status") == "complete":
-                logging.info(f"[SystemStatusClient] status.json encontrado na tentativa {i+1}.")
-                break
+                logging.info("[SystemStatusClient] status.json encontrado na tentativa %d.", attempt)
+                return result
             
             # Se o status não for 'complete', espera e tenta novamente
-            time.sleep(3)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return result
+            if self._stop_evt.wait(min(3, remaining)):
+                return result
+
+    def _wait_for_status_file(self, deadline: float) -> Dict[str, Any]:
+        """
+        Bloqueia no inotify (pasta 'results' e seus cenários) e só procura o
+        arquivo de novo a cada lote de eventos, até o prazo. Lança OSError se
+        o inotify não puder ser usado.
+        """
+        results_dir = self.results_dir
+        watch_flags = inotify_flags.CREATE | inotify_flags.MOVED_TO | inotify_flags.CLOSE_WRITE
+        with INotify() as inotify:
+            results_wd = inotify.add_watch(results_dir, watch_flags)
+            # Watch também em cada cenário: o status.json é gravado dentro deles.
+            with os.scandir(results_dir) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        inotify.add_watch(entry.path, watch_flags)
+
+            # O arquivo pode ter surgido antes do registro das watches.
+            result = self._find_and_read_status_file()
+            while result.get("status") != "complete" and not self._stop_evt.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = inotify.read(timeout=int(min(remaining, STOP_CHECK_INTERVAL) * 1000))
+                if not events:
+                    continue
+                for event in events:
+                    # Um cenário novo passa a ser vigiado assim que é criado.
+                    if event.wd == results_wd and event.mask & inotify_flags.ISDIR:
+                        try:
+                            inotify.add_watch(os.path.join(results_dir, event.name), watch_flags)
+                        except OSError:
+                            pass
+                result = self._find_and_read_status_file()
+        return result
+
+    # --- MUDANÇA PRINCIPAL AQUI ---
+    def _fetch_thread_target(self):
+        """
+        Método alvo da thread: aguarda (até 60 segundos) pelo arquivo e chama o callback.
+        """
+        logging.info("[SystemStatusClient] Iniciando busca em loop pelo status.json...")
+        deadline = time.monotonic() + 60
+        final_result = None
+        if INotify is not None:
+            try:
+                final_result = self._wait_for_status_file(deadline)
+            except OSError as e:
+                logging.warning("[SystemStatusClient] inotify indisponível (%s). Consultando a pasta periodicamente.", e)
+        if final_result is None:
+            final_result = self._poll_for_status_file(deadline)
+
+        if self._stop_evt.is_set():
+            logging.info("[SystemStatusClient] Busca pelo status.json cancelada.")
+            return
         
         if final_result.get("status") != "complete":
              logging.warning("[SystemStatusClient] Tempo de busca esgotado. status.json não foi encontrado.")
@@ -102,8 +190,12 @@ class SystemStatusClient:
 
     def start_fetching_status(self):
         """
-        Inicia a busca pelo arquivo de status em uma nova thread.
+        Inicia a busca pelo arquivo de status no pool de esperas da UI.
         Retorna imediatamente, sem bloquear a UI.
         """
-        thread = threading.Thread(target=self._fetch_thread_target, daemon=True)
-        thread.start()
\ No newline at end of file
+        self._stop_evt.clear()
+        submit_wait(self._fetch_thread_target)
+
+    def stop(self):
+        """Cancela a busca em andamento; o callback não será chamado."""
+        self._stop_evt.set()
\ No newline at end of file
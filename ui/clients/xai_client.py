@@ -14,12 +14,113 @@ import json
 import threading
 import time
 import logging
+from pathlib import Path
 from typing import Callable, List
 
+from ui.clients._executor import submit_io, submit_wait
+from ui.clients._json_io import read_json
+from ui.clients._scenario_cache import get_latest_scenario_dir
+
+# Raiz do projeto, resolvida uma única vez na importação do módulo.
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+
+# Pedidos e respostas partilham a pasta captum/queue do cenário (ver xai_worker):
+# '<agent_id>.req' é atendido com '<agent_id>.resp'. O back-end grava a resposta
+# em '.resp.tmp' e a renomeia (write_response_file), então um '.resp' visível
+# já está completo.
+XAI_QUEUE_DIRNAME = "queue"
+REQUEST_SUFFIX = ".req"
+RESPONSE_SUFFIX = ".resp"
+
+# Espera pela resposta: intervalos curtos no início (a análise costuma ser
+# rápida), crescendo até um teto para não gastar stat à toa nas mais longas.
+POLL_INITIAL_INTERVAL = 0.05
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_INTERVAL = 1.0
+
+# Um status.json até este tamanho é lido direto na thread que pediu a lista de
+# agentes: a leitura custa menos que despachar a tarefa para o pool.
+SYNC_READ_MAX_BYTES = 64 * 1024
+
+# Com inotify (Linux), a espera acorda assim que a resposta é gravada na pasta.
+# É opcional: sem ele, fica só o polling com backoff.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+class _ResponseWatcher:
+    """
+    Uma única thread de inotify por XaiClient, criada no primeiro pedido, que
+    vigia as pastas de fila e acorda a análise que espera por cada resposta.
+    Assim, várias análises simultâneas não fazem polling cada uma por si.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inotify = None
+        self._unavailable = INotify is None
+        self._thread: threading.Thread | None = None
+        # wd do inotify -> pasta vigiada; caminho da resposta -> evento de quem espera.
+        self._watched_dirs: dict[int, str] = {}
+        self._pending: dict[str, threading.Event] = {}
+
+    def register(self, queue_dir: str, response_path: str) -> threading.Event | None:
+        """
+        Retorna o evento sinalizado quando 'response_path' for gravado, ou None
+        se o inotify não puder ser usado (quem chama recorre ao polling).
+        """
+        with self._lock:
+            if self._unavailable:
+                return None
+            try:
+                if self._inotify is None:
+                    self._inotify = INotify()
+                    self._thread = threading.Thread(target=self._run, name="xai-response-watcher", daemon=True)
+                    self._thread.start()
+                if queue_dir not in self._watched_dirs.values():
+                    # O worker grava num temporário e renomeia: MOVED_TO é o evento final.
+                    wd = self._inotify.add_watch(queue_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+                    self._watched_dirs[wd] = queue_dir
+            except OSError as e:
+                logging.warning("[XaiClient] inotify indisponível (%s). Usando apenas polling.", e)
+                if self._inotify is None:
+                    self._unavailable = True
+                return None
+            event = threading.Event()
+            self._pending[response_path] = event
+            return event
+
+    def unregister(self, response_path: str):
+        with self._lock:
+            self._pending.pop(response_path, None)
+
+    def wake_all(self):
+        """Acorda todas as esperas (usado por XaiClient.stop)."""
+        with self._lock:
+            for event in self._pending.values():
+                event.set()
+
+    def _run(self):
+        while True:
+            for event in self._inotify.read():
+                with self._lock:
+                    if event.mask & inotify_flags.IGNORED:
+                        # A pasta foi removida; será vigiada de novo no próximo pedido.
+                        self._watched_dirs.pop(event.wd, None)
+                        continue
+                    queue_dir = self._watched_dirs.get(event.wd)
+                    if queue_dir is None or not event.name:
+                        continue
+                    waiter = self._pending.get(os.path.join(queue_dir, event.name))
+                if waiter is not None:
+                    waiter.set()
+
 class XaiClient:
     """
     Gerencia a comunicação para iniciar análises XAI e carregar a lista de agentes.
     """
+    project_root = _PROJECT_ROOT
+
     def __init__(self, on_analysis_complete_callback: Callable[[dict], None]):
         """
         Inicializa o cliente.
@@ -28,24 +129,22 @@ class XaiClient:
             on_analysis_complete_callback: A função a ser chamada quando a análise XAI terminar.
         """
         self.on_analysis_complete = on_analysis_complete_callback
-        self.project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        # Sinalizado por stop(): encerra as esperas por resposta sem chamar o callback.
+        self._stop_evt = threading.Event()
+        self._response_watcher = _ResponseWatcher()
+        # Lista de agentes do último status.json lido, por (caminho, st_mtime_ns).
+        self._agent_list_key: tuple[str, int] | None = None
+        self._agent_list: List[str] = []
+        # Pasta de fila (captum/queue) já garantida, por cenário: o makedirs só
+        # roda na primeira análise de cada cenário.
+        self._queue_dirs: dict[str, str] = {}
 
     def _find_latest_scenario_path(self):
         """Encontra o caminho absoluto para a pasta de cenário mais recente."""
         try:
-            results_dir = os.path.join(self.project_root, "results")
-            if os.path.exists(results_dir):
-                ignored_dirs = {"database"}
-                all_scenarios = [
-                    d for d in os.listdir(results_dir) 
-                    if os.path.isdir(os.path.join(results_dir, d)) and d not in ignored_dirs
-                ]
-                if all_scenarios:
-                    latest_scenario_name = max(all_scenarios, key=lambda d: os.path.getmtime(os.path.join(results_dir, d)))
-                    return os.path.join(results_dir, latest_scenario_name)
+            return get_latest_scenario_dir(self.project_root)
         except Exception:
             return None
-        return None
 
     # --- MUDANÇA 1: O método síncrono agora é privado ---
     def _get_agent_list_sync(self) -> List[str]:
@@ -55,15 +154,43 @@ class XaiClient:
             return []
         try:
             status_file_path = os.path.join(latest_scenario_path, "status.json")
-            if os.path.exists(status_file_path):
-                with open(status_file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return data.get("agent_ids", [])
+            try:
+                status_key = (status_file_path, os.stat(status_file_path).st_mtime_ns)
+            except FileNotFoundError:
+                return []
+            if status_key != self._agent_list_key:
+                data = read_json(status_file_path)
+                self._agent_list_key, self._agent_list = status_key, data.get("agent_ids", [])
+            return list(self._agent_list)
         except Exception as e:
-            logging.error(f"[XaiClient] Erro ao carregar lista de agentes: {e}")
+            logging.error("[XaiClient] Erro ao carregar lista de agentes: %s", e)
             return []
-        return []
         
+    def _get_agent_list_fast(self) -> List[str] | None:
+        """
+        Caminho rápido, sem thread: responde se o status.json já está em cache
+        (mesmo mtime) ou é pequeno. Retorna None quando a busca deve seguir
+        para o pool de I/O.
+        """
+        latest_scenario_path = self._find_latest_scenario_path()
+        if not latest_scenario_path:
+            return None
+        status_file_path = os.path.join(latest_scenario_path, "status.json")
+        try:
+            st = os.stat(status_file_path)
+        except OSError:
+            return None
+        status_key = (status_file_path, st.st_mtime_ns)
+        if status_key != self._agent_list_key:
+            if st.st_size > SYNC_READ_MAX_BYTES:
+                return None
+            try:
+                data = read_json(status_file_path)
+            except (OSError, ValueError):
+                return None
+            self._agent_list_key, self._agent_list = status_key, data.get("agent_ids", [])
+        return list(self._agent_list)
+
     # --- MUDANÇA 2: Novo método alvo da thread para buscar a lista de agentes ---
     def _fetch_agent_list_thread_target(self, on_list_loaded_callback: Callable[[List[str]], None]):
         """
@@ -76,27 +203,86 @@ class XaiClient:
     # --- MUDANÇA 3: Novo método público para iniciar a busca assíncrona da lista ---
     def start_fetching_agent_list(self, on_list_loaded_callback: Callable[[List[str]], None]):
         """
-        Inicia a busca pela lista de agentes em uma nova thread.
+        Obtém a lista de agentes. Se o status.json já está disponível (ver
+        _get_agent_list_fast), o callback é chamado antes de retornar; caso
+        contrário, a busca segue no pool de I/O da UI.
         """
+        agent_ids = self._get_agent_list_fast()
+        if agent_ids is not None:
+            if on_list_loaded_callback:
+                on_list_loaded_callback(agent_ids)
+            return
         logging.info("[XaiClient] Iniciando busca assíncrona pela lista de agentes...")
-        thread = threading.Thread(
-            target=self._fetch_agent_list_thread_target,
-            args=(on_list_loaded_callback,),
-            daemon=True
-        )
-        thread.start()
+        submit_io(self._fetch_agent_list_thread_target, on_list_loaded_callback)
 
     # --- A lógica de análise principal permanece a mesma ---
     def start_analysis(self, agent_id: str):
         """
-        Inicia a análise XAI em uma nova thread. Retorna imediatamente.
+        Inicia a análise XAI no pool de esperas da UI. Retorna imediatamente.
         """
-        thread = threading.Thread(
-            target=self._analysis_worker_thread_target,
-            args=(agent_id,),
-            daemon=True
-        )
-        thread.start()
+        self._stop_evt.clear()
+        submit_wait(self._analysis_worker_thread_target, agent_id)
+
+    def stop(self):
+        """Cancela as análises em espera; o callback não será chamado para elas."""
+        self._stop_evt.set()
+        self._response_watcher.wake_all()
+
+    def _wait_for_response(self, queue_dir: str, response_path: str, deadline: float) -> bool:
+        """
+        Aguarda o arquivo de resposta até o prazo (relógio monotônico) ou até
+        stop(). Retorna True se ele apareceu.
+        """
+        event = self._response_watcher.register(queue_dir, response_path)
+        if event is None:
+            return self._poll_for_response(response_path, deadline)
+
+        try:
+            while True:
+                # Limpa antes de conferir: um evento que chegue depois da
+                # conferência não se perde, e o wait seguinte retorna na hora.
+                event.clear()
+                if os.path.exists(response_path):
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop_evt.is_set():
+                    return False
+                event.wait(remaining)
+        finally:
+            self._response_watcher.unregister(response_path)
+
+    def _poll_for_response(self, response_path: str, deadline: float) -> bool:
+        """Espera sem inotify: polling com backoff exponencial."""
+        interval = POLL_INITIAL_INTERVAL
+        while True:
+            if os.path.exists(response_path):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._stop_evt.wait(min(interval, remaining)):
+                return False
+            interval = min(interval * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL)
+
+    def _get_queue_dir(self, scenario_path: str) -> str:
+        """Retorna a pasta captum/queue do cenário, criando-a no primeiro uso."""
+        queue_dir = self._queue_dirs.get(scenario_path)
+        if queue_dir is None:
+            queue_dir = os.path.join(scenario_path, "captum", XAI_QUEUE_DIRNAME)
+            os.makedirs(queue_dir, exist_ok=True)
+            self._queue_dirs[scenario_path] = queue_dir
+        return queue_dir
+
+    @staticmethod
+    def _write_request(request_path: str, payload: str):
+        """
+        Grava o pedido em '.tmp' e o renomeia, para que o back-end (que só lê
+        arquivos '.req') nunca encontre um pedido incompleto.
+        """
+        tmp_path = request_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, request_path)
 
     def _analysis_worker_thread_target(self, agent_id: str, timeout_seconds: int = 300):
         """
@@ -110,41 +296,51 @@ class XaiClient:
 
         # ... (resto da lógica de análise permanece inalterada)
         try:
-            captum_base_dir = os.path.join(scenario_path, "captum")
-            requests_dir = os.path.join(captum_base_dir, "requests")
-            responses_dir = os.path.join(captum_base_dir, "responses")
-            os.makedirs(requests_dir, exist_ok=True)
-            os.makedirs(responses_dir, exist_ok=True)
+            queue_dir = self._get_queue_dir(scenario_path)
 
-            request_path = os.path.join(requests_dir, f"{agent_id}.request")
-            response_path = os.path.join(responses_dir, f"{agent_id}.response")
+            request_path = os.path.join(queue_dir, agent_id + REQUEST_SUFFIX)
+            response_path = os.path.join(queue_dir, agent_id + RESPONSE_SUFFIX)
 
-            if os.path.exists(response_path): os.remove(response_path)
-            if os.path.exists(request_path): os.remove(request_path)
+            for stale_path in (response_path, request_path):
+                try:
+                    os.unlink(stale_path)
+                except FileNotFoundError:
+                    pass
 
-            with open(request_path, "w", encoding="utf-8") as f:
-                json.dump({"agent_id": agent_id}, f)
+            payload = json.dumps({"agent_id": agent_id})
+            try:
+                self._write_request(request_path, payload)
+            except FileNotFoundError:
+                # A pasta deixou de existir (ex: cenário recriado): cria de novo e tenta outra vez.
+                os.makedirs(queue_dir, exist_ok=True)
+                self._write_request(request_path, payload)
         
         except Exception as e:
             if self.on_analysis_complete:
                 self.on_analysis_complete({"status": "error", "message": f"Falha ao criar arquivo de pedido: {e}"})
             return
 
-        start_time = time.time()
+        deadline = time.monotonic() + timeout_seconds
         response_data = None
         
-        while time.time() - start_time < timeout_seconds:
-            if os.path.exists(response_path):
-                try:
-                    time.sleep(0.2) 
-                    with open(response_path, "r", encoding="utf-8") as f:
-                        response_data = json.load(f)
-                    os.remove(response_path)
-                    break 
-                except Exception as e:
-                    response_data = {"status": "error", "message": f"Falha ao ler arquivo de resposta: {e}"}
-                    break
-            time.sleep(2)
+        while response_data is None and self._wait_for_response(queue_dir, response_path, deadline):
+            try:
+                response_data = read_json(response_path)
+            except (FileNotFoundError, json.JSONDecodeError):
+                # Não deveria ocorrer com a troca atômica; volta a esperar no próximo ciclo.
+                time.sleep(POLL_INITIAL_INTERVAL)
+                continue
+            except Exception as e:
+                response_data = {"status": "error", "message": f"Falha ao ler arquivo de resposta: {e}"}
+                break
+            try:
+                os.remove(response_path)
+            except FileNotFoundError:
+                pass
+
+        if response_data is None and self._stop_evt.is_set():
+            logging.info("[XaiClient] Análise do agente '%s' cancelada.", agent_id)
+            return
 
         if response_data is None: 
             response_data = {"status": "error", "message": "Tempo de espera esgotado. O back-end não respondeu."}
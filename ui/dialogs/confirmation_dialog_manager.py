@@ -2,19 +2,31 @@
 # Author: Gabriel Moraes
 # Date: 29 de Setembro de 2025
 
-import flet as ft
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
 from ..handlers.locale_manager import LocaleManager
 
+# O flet é importado apenas quando um diálogo é de fato criado ou exibido,
+# para que importar este módulo não carregue o flet em caminhos sem UI.
+if TYPE_CHECKING:
+    import flet as ft
+
 class ConfirmationDialogManager:
     """
     Gerencia a exibição de diálogos de confirmação e informativos.
     """
-    def __init__(self, page: ft.Page, locale_manager: LocaleManager):
+    def __init__(self, page: 'ft.Page', locale_manager: LocaleManager):
+        import flet as ft
+
         self.page = page
         self.locale_manager = locale_manager
         self._on_confirm_callback: Callable | None = None
+        # Estado já aplicado aos controles, para não reatribuí-lo a cada exibição
+        # (cada atribuição entra no diff enviado ao cliente Flet no page.update).
+        self._current_actions_mode: str | None = None
+        self._translated_lang_code: str | None = None
+        # Último estado enviado ao cliente (ver _update_page).
+        self._last_state_key: tuple | None = None
 
         self._confirm_button = ft.ElevatedButton(on_click=self._handle_confirm)
         self._cancel_button = ft.TextButton(on_click=self._handle_cancel)
@@ -41,6 +53,10 @@ class ConfirmationDialogManager:
         self.update_translations()
 
     def update_translations(self):
+        lang_code = self.locale_manager.current_lang_code
+        if lang_code is not None and lang_code == self._translated_lang_code:
+            return
+        self._translated_lang_code = lang_code
         self._confirm_button.text = self.locale_manager.get_string("dialogs.confirm_button")
         self._cancel_button.text = self.locale_manager.get_string("dialogs.cancel_button")
         self._close_button.text = self.locale_manager.get_string("dialogs.close_button")
@@ -49,38 +65,63 @@ class ConfirmationDialogManager:
         """
         Exibe um diálogo de confirmação com dois botões (Confirmar/Cancelar).
         """
+        import flet as ft
+
         self._on_confirm_callback = on_confirm
         
         self._dialog_title_text.value = title
         self._dialog.content.value = content
         
         # --- MUDANÇA 2: Definir as ações para um diálogo de confirmação ---
-        self._dialog.actions = [self._cancel_button, self._confirm_button]
-        self._dialog.actions_alignment = ft.MainAxisAlignment.SPACE_BETWEEN
+        if self._current_actions_mode != "confirm":
+            self._dialog.actions = [self._cancel_button, self._confirm_button]
+            self._dialog.actions_alignment = ft.MainAxisAlignment.SPACE_BETWEEN
+            self._current_actions_mode = "confirm"
         
         self._dialog.open = True
-        if self.page: self.page.update()
+        self._update_page()
 
     # --- MUDANÇA 3: Novo método para exibir um diálogo informativo ---
     def show_info(self, title: str, content: str):
         """
         Exibe um diálogo informativo com apenas um botão "Fechar".
         """
+        import flet as ft
+
         self._on_confirm_callback = None # Nenhuma ação de confirmação
         
         self._dialog_title_text.value = title
         self._dialog.content.value = content
         
         # Define as ações para um diálogo informativo
-        self._dialog.actions = [self._close_button]
-        self._dialog.actions_alignment = ft.MainAxisAlignment.END
+        if self._current_actions_mode != "info":
+            self._dialog.actions = [self._close_button]
+            self._dialog.actions_alignment = ft.MainAxisAlignment.END
+            self._current_actions_mode = "info"
 
         self._dialog.open = True
-        if self.page: self.page.update()
+        self._update_page()
 
     def _close_dialog(self):
         self._dialog.open = False
         self._on_confirm_callback = None
+        self._update_page()
+
+    def _update_page(self):
+        """
+        Envia o diálogo ao cliente Flet apenas se o seu estado visível mudou
+        desde o último envio (ex: o mesmo aviso exibido duas vezes seguidas).
+        """
+        state_key = (
+            self._dialog.open,
+            self._dialog_title_text.value,
+            self._dialog.content.value,
+            self._current_actions_mode,
+            self._translated_lang_code,
+        )
+        if state_key == self._last_state_key:
+            return
+        self._last_state_key = state_key
         if self.page: self.page.update()
 
     def _handle_confirm(self, e):
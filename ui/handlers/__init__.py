@@ -0,0 +1,18 @@
+# File: ui/handlers/__init__.py
+# Author: Gabriel Moraes
+# Date: 16 de Outubro de 2025
+
+"""
+Pacote dos handlers da UI.
+
+Alguns handlers (ex: MapAssetLoader) usam os parsers de 'src', cujos módulos
+importam uns aos outros a partir de 'src' (ex: 'utils...'). A pasta entra no
+sys.path uma única vez, aqui, na primeira importação do pacote.
+"""
+
+import os
+import sys
+
+_SRC_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src")
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
\ No newline at end of file
@@ -15,9 +15,15 @@ import threading
 import time
 import json
 import asyncio
-import websockets
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Dict, Any
 
+from ui.clients._json_io import loads_json
+
+# Mensagens recebidas e ainda não entregues à UI. Se a UI ficar para trás,
+# a leitura do socket pausa em vez de acumular memória sem limite.
+RECV_QUEUE_SIZE = 256
+
 class LiveDataProvider:
     """
     Um serviço que se conecta ao back-end via WebSocket para fornecer
@@ -32,6 +38,12 @@ class LiveDataProvider:
         
         self.uri = "ws://127.0.0.1:8765"
         self.websocket_connection = None
+        # Comandos já serializados aguardando envio. Criada a cada conexão, na
+        # thread do loop, e esvaziada pela tarefa _writer_loop.
+        self._outbox: asyncio.Queue | None = None
+        # Thread única que decodifica e entrega os pacotes, na ordem de chegada,
+        # enquanto o loop asyncio continua recebendo do socket.
+        self._dispatch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-data")
 
     def start(self):
         """Inicia o cliente WebSocket em uma thread separada."""
@@ -56,22 +68,30 @@ class LiveDataProvider:
 
     async def _websocket_thread_loop(self):
         """O loop principal que gerencia a conexão e o recebimento de dados."""
+        # Importado só aqui: quem apenas importa este módulo não paga pelo websockets.
+        import websockets
+
         while self._is_running:
             try:
                 logging.info(f"[LiveDataProvider] Tentando conectar a {self.uri}...")
-                async with websockets.connect(self.uri) as websocket:
+                # Mensagens pequenas e em rede local: a compressão só custaria zlib por mensagem.
+                async with websockets.connect(self.uri, compression=None) as websocket:
+                    # Uma fila nova por conexão: comandos de uma conexão anterior não são reenviados.
+                    self._outbox = asyncio.Queue()
+                    writer = asyncio.create_task(self._writer_loop(websocket, self._outbox))
                     self.websocket_connection = websocket
                     logging.info("[LiveDataProvider] Conectado com sucesso ao back-end (SDS).")
                     
-                    async for message in websocket:
-                        if not self._is_running:
-                            break
-                        try:
-                            data_packet = json.loads(message)
-                            if self.on_data_received:
-                                self.on_data_received(data_packet)
-                        except json.JSONDecodeError:
-                            logging.warning("[LiveDataProvider] Mensagem inválida (não-JSON) recebida do back-end.")
+                    inbox = asyncio.Queue(maxsize=RECV_QUEUE_SIZE)
+                    dispatcher = asyncio.create_task(self._dispatch_loop(inbox))
+                    try:
+                        async for message in websocket:
+                            if not self._is_running:
+                                break
+                            await inbox.put(message)
+                    finally:
+                        dispatcher.cancel()
+                        writer.cancel()
                         
             except (ConnectionRefusedError, websockets.ConnectionClosedError, websockets.ConnectionClosedOK):
                 logging.warning("[LiveDataProvider] Conexão com o back-end perdida ou recusada. Tentando novamente em 5s...")
@@ -82,24 +102,63 @@ class LiveDataProvider:
                 self.websocket_connection = None
                 await asyncio.sleep(5)
 
-    def send_command_to_backend(self, command: dict):
+    async def _writer_loop(self, websocket, outbox: asyncio.Queue):
+        """Envia, em ordem, os comandos colocados na fila por send_command_to_backend."""
+        from websockets import ConnectionClosed
+
+        while True:
+            message_json = await outbox.get()
+            try:
+                await websocket.send(message_json)
+            except ConnectionClosed:
+                return
+            except Exception as e:
+                logging.warning(f"[LiveDataProvider] Falha ao enviar comando. Erro: {e}")
+
+    async def _dispatch_loop(self, inbox: asyncio.Queue):
+        """
+        Entrega as mensagens recebidas em lotes: tudo o que chegou enquanto o
+        lote anterior era processado segue de uma vez para a thread de entrega.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await inbox.get()]
+            while not inbox.empty():
+                batch.append(inbox.get_nowait())
+            await loop.run_in_executor(self._dispatch_executor, self._dispatch_batch, batch)
+
+    def _dispatch_batch(self, batch: list):
+        """Decodifica e repassa cada mensagem do lote, em ordem, ao callback."""
+        for message in batch:
+            try:
+                data_packet = loads_json(message)
+            except json.JSONDecodeError:
+                logging.warning("[LiveDataProvider] Mensagem inválida (não-JSON) recebida do back-end.")
+                continue
+            if self.on_data_received:
+                try:
+                    self.on_data_received(data_packet)
+                except Exception as e:
+                    logging.error(f"[LiveDataProvider] Erro ao processar pacote de dados: {e}", exc_info=True)
+
+    def send_command_to_backend(self, command: dict | str):
         """
         Envia um comando (dicionário Python) para o back-end de forma segura
-        a partir de qualquer thread.
+        a partir de qualquer thread. Um comando já serializado em JSON (str)
+        é enviado como está.
         """
         # --- MUDANÇA PRINCIPAL AQUI ---
         # Verificamos apenas se os objetos existem, sem aceder a .open ou .closed
         if self.websocket_connection and self.loop:
             try:
-                message_json = json.dumps(command)
-                # O envio em si é agendado na thread do loop de eventos
-                asyncio.run_coroutine_threadsafe(
-                    self.websocket_connection.send(message_json), 
-                    self.loop
-                )
+                # Serializado aqui, na thread de quem chama. Para o loop de eventos
+                # basta um put_nowait: um único despertar, sem criar Future nem corrotina.
+                message_json = command if isinstance(command, str) else json.dumps(command, separators=(',', ':'))
+                self.loop.call_soon_threadsafe(self._outbox.put_nowait, message_json)
             except Exception as e:
-                # Se o send() falhar (por exemplo, porque a conexão foi fechada),
-                # capturamos a exceção aqui.
+                # Se o agendamento falhar (por exemplo, porque o loop já foi
+                # encerrado), capturamos a exceção aqui. Falhas do envio em si
+                # são registradas pela _writer_loop.
                 logging.warning(f"[LiveDataProvider] Falha ao enviar comando. A conexão pode estar fechada. Erro: {e}")
         else:
             logging.warning("[LiveDataProvider] Tentativa de enviar comando sem uma conexão ativa com o back-end.")
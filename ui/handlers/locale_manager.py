@@ -11,9 +11,19 @@ Nesta versão, o método get_string foi atualizado para aceitar um argumento
 import os
 import json
 import logging
-from typing import Dict, Any, List
+import pickle
+from typing import Dict, Any
 
+from ui.clients._json_io import read_json
 from ui.handlers.settings_handler import SettingsHandler
+# A pasta 'src' entra no sys.path em ui/handlers/__init__.py
+from src.utils.paths import get_base_output_dir
+
+# As traduções já achatadas ficam em <saída>/cache/locales/<idioma>.pkl e são
+# reaproveitadas enquanto forem mais recentes que o JSON de origem.
+LOCALE_CACHE_SUBDIR = os.path.join("cache", "locales")
+# Incrementar sempre que o formato gravado no pickle mudar.
+LOCALE_CACHE_VERSION = 1
 
 class LocaleManager:
     """
@@ -26,9 +36,13 @@ class LocaleManager:
         """
         self.locales_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "locales"))
         self.fallback_lang_code = "en_us"
+        self.current_lang_code: str | None = None
+        # Fica fora de ui/locales, que pode não ser gravável (ex: bundle PyInstaller).
+        self.cache_dir = os.path.join(get_base_output_dir(), LOCALE_CACHE_SUBDIR)
         
-        self.current_lang_data: Dict[str, Any] = {}
-        self.fallback_lang_data: Dict[str, Any] = {}
+        # Traduções achatadas em "secao.chave" -> texto (ver _flatten).
+        self.current_flat: Dict[str, str] = {}
+        self.fallback_flat: Dict[str, str] = {}
 
         settings_handler = SettingsHandler()
         current_settings = settings_handler.get_current_settings()
@@ -47,8 +61,7 @@ class LocaleManager:
             return {}
         
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return read_json(file_path)
         except (json.JSONDecodeError, IOError) as e:
             logging.error(f"[LocaleManager] Falha ao carregar ou processar o arquivo '{file_path}': {e}")
             return {}
@@ -60,28 +73,84 @@ class LocaleManager:
         """
         logging.info(f"[LocaleManager] Carregando idioma: '{lang_code}'...")
         
-        self.fallback_lang_data = self._load_file(self.fallback_lang_code)
-        if not self.fallback_lang_data:
-            logging.critical("[LocaleManager] FALHA CRÍTICA: Não foi possível carregar o idioma de fallback (en_us).")
+        # O fallback não muda durante a execução: é lido só na primeira vez
+        # (ou de novo, se essa leitura tiver falhado).
+        if not self.fallback_flat:
+            self.fallback_flat = self._load_flat(self.fallback_lang_code)
+            if not self.fallback_flat:
+                logging.critical("[LocaleManager] FALHA CRÍTICA: Não foi possível carregar o idioma de fallback (en_us).")
 
         if lang_code == self.fallback_lang_code:
-            self.current_lang_data = self.fallback_lang_data
+            self.current_flat = self.fallback_flat
         else:
-            self.current_lang_data = self._load_file(lang_code)
+            self.current_flat = self._load_flat(lang_code)
+        self.current_lang_code = lang_code
         
         logging.info(f"'{lang_code}' carregado com sucesso.")
 
-    def _get_nested_value(self, data: Dict, keys: List[str]) -> str | None:
+    def _flatten(self, data: Dict, prefix: str = "") -> Dict[str, str]:
+        """
+        Achata o dicionário aninhado em chaves com pontos (ex: "main_ui.app_title"),
+        uma única vez por carga de idioma. Só as folhas escalares viram texto,
+        assim get_string resolve cada chave com uma única busca no dict.
+        """
+        flat: Dict[str, str] = {}
+        for key, value in data.items():
+            full_key = f"{prefix}{key}"
+            if isinstance(value, dict):
+                flat.update(self._flatten(value, f"{full_key}."))
+            elif isinstance(value, (str, int, float, bool)):
+                flat[full_key] = str(value)
+        return flat
+
+    def _load_flat(self, lang_code: str) -> Dict[str, str]:
         """
-        Navega em um dicionário aninhado usando uma lista de chaves.
+        Retorna as traduções achatadas de um idioma: do cache em disco, se ele
+        for válido, ou lendo e achatando o JSON (e regravando o cache).
         """
-        temp_dict = data
-        for key in keys:
-            if isinstance(temp_dict, dict) and key in temp_dict:
-                temp_dict = temp_dict[key]
-            else:
+        file_path = os.path.join(self.locales_dir, f"{lang_code}.json")
+        cache_path = os.path.join(self.cache_dir, f"{lang_code}.pkl")
+
+        cached = self._load_flat_cache(file_path, cache_path)
+        if cached is not None:
+            return cached
+
+        flat = self._flatten(self._load_file(lang_code))
+        if flat:
+            self._save_flat_cache(cache_path, flat)
+        return flat
+
+    def _load_flat_cache(self, file_path: str, cache_path: str) -> Dict[str, str] | None:
+        """
+        Carrega o cache se ele for mais recente que o JSON de origem e tiver a
+        versão de formato atual. Retorna None se não houver cache válido.
+        """
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(file_path):
+                return None
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if not (isinstance(cached, tuple) and len(cached) == 2 and cached[0] == LOCALE_CACHE_VERSION
+                    and isinstance(cached[1], dict)):
+                logging.info(f"[LocaleManager] Cache de tradução em formato antigo em '{cache_path}', a reprocessar o JSON.")
                 return None
-        return str(temp_dict) if isinstance(temp_dict, (str, int, float, bool)) else None
+            return cached[1]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"[LocaleManager] Cache de tradução inválido em '{cache_path}', a reprocessar o JSON. Erro: {e}")
+            return None
+
+    def _save_flat_cache(self, cache_path: str, flat: Dict[str, str]):
+        """Salva as traduções achatadas no cache (melhor esforço)."""
+        tmp_path = cache_path + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump((LOCALE_CACHE_VERSION, flat), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"[LocaleManager] Não foi possível salvar o cache de tradução em '{cache_path}': {e}")
 
     # --- MUDANÇA PRINCIPAL AQUI ---
     def get_string(self, key: str, fallback: str = None) -> str:
@@ -89,16 +158,14 @@ class LocaleManager:
         Obtém uma string de tradução usando uma chave aninhada (ex: "main_ui.app_title").
         Implementa a lógica de fallback para o inglês e para um valor padrão.
         """
-        keys = key.split('.')
-        
         # 1. Tenta a tradução no idioma atual
-        translation = self._get_nested_value(self.current_lang_data, keys)
+        translation = self.current_flat.get(key)
         if translation is not None:
             return translation
             
         # 2. Se falhar, tenta a tradução no idioma de fallback (inglês)
         logging.warning(f"[LocaleManager] Chave '{key}' não encontrada no idioma atual. Tentando fallback para inglês...")
-        fallback_translation = self._get_nested_value(self.fallback_lang_data, keys)
+        fallback_translation = self.fallback_flat.get(key)
         if fallback_translation is not None:
             return fallback_translation
             
@@ -13,10 +13,10 @@ controlado, para evitar a sobrecarga da thread da UI.
 import flet as ft
 import flet.canvas as cv
 import logging
+import numpy as np
 import threading
 import time
-import queue
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Callable, Dict, Any, TYPE_CHECKING
 
 from ui.widgets.traffic_light_widget import TrafficLightWidget
 
@@ -25,6 +25,40 @@ if TYPE_CHECKING:
     from ui.views.dashboard_view import DashboardView
     from ui.widgets.control_panel_widget import ControlPanelWidget
 
+# Resolução da tabela de cores de congestionamento: 256 tons entre 0% e 100%.
+COLOR_LUT_SIZE = 256
+
+def _compute_congestion_color(normalized_value: float) -> str:
+    """Escala azul -> ciano -> verde -> amarelo -> vermelho para um valor em [0, 1]."""
+    red, green, blue = 0, 0, 0
+    if normalized_value < 0.25:
+        p = normalized_value / 0.25; red = 0; green = int(255 * p); blue = int(128 + 127 * p)
+    elif normalized_value < 0.5:
+        p = (normalized_value - 0.25) / 0.25; red = 0; green = 255; blue = int(255 * (1 - p))
+    elif normalized_value < 0.75:
+        p = (normalized_value - 0.5) / 0.25; red = int(255 * p); green = 255; blue = 0
+    else:
+        p = (normalized_value - 0.75) / 0.25; red = 255; green = int(255 * (1 - p)); blue = 0
+    return "#" + bytes((red, green, blue)).hex()
+
+# As cores são montadas uma única vez na importação; no loop de renderização
+# cada rua custa só uma indexação.
+_CONGESTION_COLOR_LUT = tuple(
+    _compute_congestion_color(i / (COLOR_LUT_SIZE - 1)) for i in range(COLOR_LUT_SIZE)
+)
+# A mesma tabela como array NumPy, para indexar todas as ruas de uma só vez.
+_CONGESTION_COLOR_ARRAY = np.array(_CONGESTION_COLOR_LUT, dtype=object)
+
+# O painel de detalhes é atualizado a cada N ciclos do loop (o pisca-pisca e
+# as ruas seguem a cada ciclo).
+PANEL_REFRESH_EVERY = 2
+
+# Estado exibido por um semáforo com estado forçado, em função do pisca-pisca.
+_OVERRIDE_STATE_FNS: Dict[str, Callable[[bool], str]] = {
+    'ALERT': lambda blink: 'YELLOW' if blink else 'OFF',
+    'OFF': lambda blink: 'OFF',
+}
+
 class MapAnimator:
     """
     Gerencia uma thread para aplicar atualizações visuais de alta frequência.
@@ -45,6 +79,9 @@ class MapAnimator:
         self.edge_paths = edge_paths or {}
         self.semaforo_widgets = semaforo_widgets or {}
         self.interval = interval
+        # Ordem fixa das ruas, para converter o congestionamento em um vetor.
+        self._edge_ids = list(self.edge_paths)
+        self._edge_path_objects = list(self.edge_paths.values())
         
         self.thread = None
         self.is_running = False
@@ -52,10 +89,32 @@ class MapAnimator:
         self.data_lock = threading.Lock()
         self.latest_congestion_data: Dict[str, Dict] = {} 
         self.latest_panel_data: Dict[str, Dict] = {}
+        self.latest_maturity_phases: Dict[str, str] = {}
 
-        self.command_queue = queue.Queue()
+        # Comandos pendentes, agrupados por chave: só o último de cada chave vale.
+        # Uma vaga para a seleção e um dict de estados forçados por semáforo,
+        # protegidos por command_lock e aplicados a cada ciclo (ver _drain_commands).
+        self.command_lock = threading.Lock()
+        self._pending_selection: tuple[str | None, str | None] | None = None
+        self._pending_overrides: Dict[str, str | None] = {}
         self.overrides: Dict[str, str] = {}
+        # Função de estado de cada semáforo forçado, refeita só quando
+        # self.overrides muda (ver _drain_commands).
+        self._override_state_fn: Dict[str, Callable[[bool], str]] = {}
         self.blink_toggle = False
+        # Última cor aplicada a cada rua: só as que mudaram são reatribuídas
+        # (e, portanto, enviadas ao cliente Flet no update seguinte).
+        self._last_colors: Dict[str, str] = {}
+        # Último estado enviado a cada semáforo, pelo mesmo motivo.
+        self._last_sem_state: Dict[str, str] = {}
+        # Contador de ciclos e últimos dados exibidos no painel de detalhes:
+        # o painel só é redesenhado quando algo nele mudou.
+        self._tick = 0
+        self._last_panel_key: tuple | None = None
+        # Seleção e modo atuais, lidos da DashboardView só aqui e depois
+        # atualizados pelos comandos "selection" (ver post_command).
+        self._sel_id: str | None = dashboard_view.selected_semaphore_id if dashboard_view else None
+        self._sel_mode: str | None = dashboard_view.current_mode if dashboard_view else None
 
     def start(self):
         if not self.thread or not self.thread.is_alive():
@@ -66,9 +125,16 @@ class MapAnimator:
 
     def stop(self):
         self.is_running = False
+        self._last_colors.clear()
+        self._last_sem_state.clear()
         logging.info("[MapAnimator] Sinal para parar a thread de animação enviado.")
 
     def update_data(self, data_packet: dict):
+        """
+        Guarda as referências aos dicionários do pacote (recém-decodificados,
+        um por pacote). O loop de renderização só as lê, sem copiá-las:
+        nenhum dos lados pode alterá-los depois de publicados aqui.
+        """
         with self.data_lock:
             if data_packet.get("type") == "initial_map_geometry":
                  self.latest_congestion_data = data_packet.get("congestion_update", {})
@@ -76,66 +142,125 @@ class MapAnimator:
                 self.latest_congestion_data = data_packet.get("payload", {})
             
             self.latest_panel_data = data_packet.get("panel_data", {})
+            if data_packet.get("maturity_phases"):
+                self.latest_maturity_phases = data_packet.get("maturity_phases")
+
+    def post_command(self, command: dict):
+        """
+        Registra um comando para o próximo ciclo: mudanças de seleção
+        ({"type": "selection", "id", "mode"}) e estados forçados de semáforo
+        ({"id", "state"}; 'ALERT' e 'OFF' são mantidos, outros os removem).
+
+        Um comando novo substitui o pendente de mesma chave (a seleção, ou o
+        mesmo semáforo), então o volume pendente é limitado sem perder o último
+        estado de nenhum semáforo.
+        """
+        with self.command_lock:
+            if command.get("type") == "selection":
+                self._pending_selection = (command.get("id"), command.get("mode"))
+            else:
+                self._pending_overrides[command.get("id")] = command.get("state")
+
+    def _drain_commands(self):
+        """
+        Aplica os comandos registrados por post_command desde o último ciclo.
+        """
+        with self.command_lock:
+            selection, self._pending_selection = self._pending_selection, None
+            pending_overrides, self._pending_overrides = self._pending_overrides, {}
+
+        if selection is not None:
+            self._sel_id, self._sel_mode = selection
+
+        overrides_changed = False
+        for semaforo_id, state in pending_overrides.items():
+            if state in _OVERRIDE_STATE_FNS:
+                overrides_changed |= self.overrides.get(semaforo_id) != state
+                self.overrides[semaforo_id] = state
+            else:
+                overrides_changed |= self.overrides.pop(semaforo_id, None) is not None
+
+        if overrides_changed:
+            self._override_state_fn = {
+                semaforo_id: _OVERRIDE_STATE_FNS[state] for semaforo_id, state in self.overrides.items()
+            }
 
     def _get_color_for_congestion(self, value: float, max_value: float = 100.0) -> str:
-        normalized_value = min(max(value / max_value, 0.0), 1.0)
-        red, green, blue = 0, 0, 0
-        if normalized_value < 0.25:
-            p = normalized_value / 0.25; red = 0; green = int(255 * p); blue = int(128 + 127 * p)
-        elif normalized_value < 0.5:
-            p = (normalized_value - 0.25) / 0.25; red = 0; green = 255; blue = int(255 * (1 - p))
-        elif normalized_value < 0.75:
-            p = (normalized_value - 0.5) / 0.25; red = int(255 * p); green = 255; blue = 0
-        else:
-            p = (normalized_value - 0.75) / 0.25; red = 255; green = int(255 * (1 - p)); blue = 0
-        return f"#{red:02x}{green:02x}{blue:02x}"
+        index = int(value * ((COLOR_LUT_SIZE - 1) / max_value))
+        return _CONGESTION_COLOR_LUT[min(COLOR_LUT_SIZE - 1, max(0, index))]
+
+    def _colors_for_edges(self, congestion: Dict[str, float], max_value: float = 100.0) -> np.ndarray:
+        """
+        Cores de todas as ruas (na ordem de self._edge_ids) em uma única passada
+        vetorizada: conversão para índice, limite e consulta à tabela.
+        """
+        get = congestion.get
+        values = np.fromiter((get(edge_id, 0.0) for edge_id in self._edge_ids),
+                             dtype=np.float64, count=len(self._edge_ids))
+        indices = np.clip((values * ((COLOR_LUT_SIZE - 1) / max_value)).astype(np.int32), 0, COLOR_LUT_SIZE - 1)
+        return _CONGESTION_COLOR_ARRAY[indices]
 
     def _updater_loop(self):
         """O loop que lê os dados mais recentes e aplica TODAS as atualizações visuais."""
         while self.is_running:
             try:
                 self.blink_toggle = not self.blink_toggle
+                self._tick += 1
 
+                # Troca de referências sob o lock, sem cópia (ver update_data).
                 with self.data_lock:
-                    congestion_to_render = self.latest_congestion_data.copy()
-                    panel_data_to_render = self.latest_panel_data.copy()
+                    congestion_to_render = self.latest_congestion_data
+                    panel_data_to_render = self.latest_panel_data
+                    maturity_phases = self.latest_maturity_phases
+
+                self._drain_commands()
 
                 if self.edge_paths and congestion_to_render:
-                    for edge_id, path_object in self.edge_paths.items():
-                        congestion_value = congestion_to_render.get(edge_id, 0.0)
-                        new_color = self._get_color_for_congestion(congestion_value)
-                        path_object.paint.color = new_color
+                    last_colors = self._last_colors
+                    for edge_id, path_object, new_color in zip(
+                        self._edge_ids, self._edge_path_objects, self._colors_for_edges(congestion_to_render)
+                    ):
+                        if last_colors.get(edge_id) != new_color:
+                            path_object.paint.color = new_color
+                            last_colors[edge_id] = new_color
 
                 if self.semaforo_widgets and panel_data_to_render:
+                    blink = self.blink_toggle
+                    override_state_fn = self._override_state_fn
+                    last_sem_state = self._last_sem_state
                     for semaforo_id, widget in self.semaforo_widgets.items():
-                        override_state = self.overrides.get(semaforo_id)
-                        if override_state:
-                            if override_state == 'ALERT':
-                                widget.set_state('YELLOW' if self.blink_toggle else 'OFF')
-                            elif override_state == 'OFF':
-                                widget.set_state('OFF')
+                        state_fn = override_state_fn.get(semaforo_id)
+                        if state_fn:
+                            new_state = state_fn(blink)
                         else:
-                            semaforo_data = panel_data_to_render.get(semaforo_id, {})
-                            new_state = semaforo_data.get("display_state", "RED")
+                            new_state = panel_data_to_render.get(semaforo_id, {}).get("display_state", "RED")
+                        if last_sem_state.get(semaforo_id) != new_state:
                             widget.set_state(new_state)
+                            last_sem_state[semaforo_id] = new_state
 
                 # --- MUDANÇA 2: Nova responsabilidade - Atualizar o painel de detalhes ---
-                # Acessa o estado diretamente da DashboardView para saber qual item está selecionado
-                selected_id = self.dashboard_view.selected_semaphore_id
+                # A seleção chega por post_command (ver _drain_commands)
+                selected_id = self._sel_id
                 
                 # Só atualiza o painel se ele estiver visível e um semáforo estiver selecionado
-                if selected_id and self.control_panel.specific_controls.visible:
+                if not (selected_id and self.control_panel.specific_controls.visible):
+                    # Ao reabrir o painel, ele é redesenhado mesmo com os mesmos dados.
+                    self._last_panel_key = None
+                elif self._tick % PANEL_REFRESH_EVERY == 0:
                     semaphore_data = panel_data_to_render.get(selected_id, {})
-                    phase = self.dashboard_view.maturity_phases.get(selected_id, "UNKNOWN")
-                    mode = self.dashboard_view.current_mode
+                    phase = maturity_phases.get(selected_id, "UNKNOWN")
+                    mode = self._sel_mode
                     
-                    # Comanda a atualização do painel de detalhes (isto irá chamar .update() internamente)
-                    self.control_panel.exibir_controles_semaforo(
-                        selected_id,
-                        semaphore_data,
-                        phase,
-                        mode
-                    )
+                    panel_key = (selected_id, phase, mode, semaphore_data)
+                    if panel_key != self._last_panel_key:
+                        self._last_panel_key = panel_key
+                        # Comanda a atualização do painel de detalhes (isto irá chamar .update() internamente)
+                        self.control_panel.exibir_controles_semaforo(
+                            selected_id,
+                            semaphore_data,
+                            phase,
+                            mode
+                        )
                 # --- FIM DA MUDANÇA 2 ---
 
                 # A atualização principal do mapa ainda é necessária
@@ -12,18 +12,14 @@ simulação mais recente.
 """
 
 import os
-import json
 import logging
 from typing import Dict, Any, Tuple
 
-# A importação do src é necessária para que o módulo da UI encontre o de utils
-import sys
-project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-src_path_to_add = os.path.join(project_root_path, "src")
-if src_path_to_add not in sys.path:
-    sys.path.insert(0, src_path_to_add)
+# A pasta 'src' entra no sys.path em ui/handlers/__init__.py
 
 from src.utils.map_data_parser import parse_map_data
+from ui.clients._json_io import read_json
+from ui.clients._scenario_cache import get_latest_scenario_dir
 
 class MapAssetLoader:
     """Encontra e carrega arquivos de ativos da simulação mais recente."""
@@ -33,30 +29,23 @@ class MapAssetLoader:
         self.project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
     def _find_latest_scenario_dir(self) -> str | None:
-        """Encontra o caminho absoluto para a pasta de cenário mais recente."""
+        """
+        Encontra o caminho absoluto para a pasta de cenário mais recente.
+
+        Usa a varredura memoizada partilhada com os clientes da UI (uma única
+        passada de os.scandir, invalidada pelo mtime de 'results'), que também
+        ignora as pastas de serviço como 'database'.
+        """
         try:
-            results_dir = os.path.join(self.project_root, "results")
-            if not os.path.exists(results_dir):
+            latest_scenario_dir = get_latest_scenario_dir(self.project_root)
+            if latest_scenario_dir:
+                return latest_scenario_dir
+
+            if not os.path.isdir(os.path.join(self.project_root, "results")):
                 logging.warning("[AssetLoader] Diretório 'results' não encontrado.")
-                return None
-            
-            # --- MUDANÇA PRINCIPAL AQUI ---
-            # Define um conjunto de pastas de serviço a serem ignoradas.
-            ignored_dirs = {"database"}
-            
-            # Filtra a lista de diretórios para remover as pastas ignoradas.
-            all_scenarios = [
-                d for d in os.listdir(results_dir) 
-                if os.path.isdir(os.path.join(results_dir, d)) and d not in ignored_dirs
-            ]
-            # --- FIM DA MUDANÇA ---
-
-            if not all_scenarios:
+            else:
                 logging.warning("[AssetLoader] Nenhum cenário encontrado no diretório 'results'.")
-                return None
-                
-            latest_scenario_name = max(all_scenarios, key=lambda d: os.path.getmtime(os.path.join(results_dir, d)))
-            return os.path.join(results_dir, latest_scenario_name)
+            return None
         except Exception as e:
             logging.error(f"[AssetLoader] Erro ao procurar o diretório do cenário mais recente: {e}")
             return None
@@ -82,8 +71,7 @@ class MapAssetLoader:
             return None
         
         try:
-            with open(coords_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return read_json(coords_path)
         except Exception as e:
             logging.error(f"[AssetLoader] Falha ao ler ou processar 'map_coords.json': {e}")
             return None
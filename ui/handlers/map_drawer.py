@@ -11,6 +11,8 @@ de azul escuro, representando um estado de trânsito baixo ou nulo.
 
 import flet as ft
 import flet.canvas as cv
+import numpy as np
+from itertools import chain
 from typing import Dict, Any, List
 
 class MapDrawer:
@@ -28,6 +30,21 @@ class MapDrawer:
         """
         self.nodes = nodes
         self.edges = edges
+        # Todos os pontos do mapa num array (N, 2), montado uma vez: primeiro os
+        # nós (na ordem de nodes.values()), depois as formas das ruas, em sequência.
+        # Serve ao retângulo envolvente e à transformação vetorizada do desenho.
+        node_xy = chain.from_iterable((n['x'], n['y']) for n in nodes.values())
+        shape_xy = chain.from_iterable(chain.from_iterable(e['shape'] for e in edges))
+        self._all_xy = np.fromiter(chain(node_xy, shape_xy), dtype=np.float64).reshape(-1, 2)
+        # O restante do mapa também em estrutura de arrays, para que o desenho não
+        # precise voltar aos dicionários: IDs das ruas, limites de cada forma
+        # dentro dos pontos das ruas e os índices dos nós que não são semáforos.
+        self._num_nodes = len(nodes)
+        self._edge_ids = [e.get('id') for e in edges]
+        self._edge_bounds = np.cumsum([0] + [len(e['shape']) for e in edges]).tolist()
+        self._plain_node_idx = np.flatnonzero(np.fromiter(
+            (n.get('type') != 'traffic_light' for n in nodes.values()), dtype=bool, count=self._num_nodes
+        ))
 
         # Atributos que serão calculados pela transformação
         self.scale = 1.0
@@ -41,10 +58,8 @@ class MapDrawer:
         Calcula todos os valores necessários (escala, centros) para a
         transformação de coordenadas. Este método deve ser chamado antes do desenho.
         """
-        all_x = [n['x'] for n in self.nodes.values()] + [p[0] for e in self.edges for p in e['shape']]
-        all_y = [n['y'] for n in self.nodes.values()] + [p[1] for e in self.edges for p in e['shape']]
-        min_x, max_x = min(all_x), max(all_x)
-        min_y, max_y = min(all_y), max(all_y)
+        min_x, min_y = self._all_xy.min(axis=0).tolist()
+        max_x, max_y = self._all_xy.max(axis=0).tolist()
         map_width = max_x - min_x
         map_height = max_y - min_y
         
@@ -80,19 +95,26 @@ class MapDrawer:
             Dict[str, cv.Path]: Um dicionário mapeando ID da rua para o objeto Path criado.
         """
         edge_paths = {}
+        # As formas são acumuladas localmente e entregues ao Canvas de uma só vez.
+        new_shapes = []
+        # A transformação de _transform_point aplicada a todos os pontos numa só
+        # operação vetorizada; tolist() devolve floats Python para o Flet.
+        offset = np.array([self.sumo_center_x, self.sumo_center_y])
+        factor = np.array([self.scale, -self.scale])
+        origin = np.array([self.canvas_center_x, self.canvas_center_y])
+        canvas_xy = (self._all_xy - offset) * factor + origin
+        num_nodes = self._num_nodes
+        shape_points = canvas_xy[num_nodes:].tolist()
+        bounds = self._edge_bounds
         
         # Primeiro, desenha as ruas
-        for edge in self.edges:
-            edge_id = edge.get('id')
-            if not edge_id: continue
+        for edge_id, start, end in zip(self._edge_ids, bounds, bounds[1:]):
+            # Ruas sem ID ou sem pontos na forma não são desenhadas.
+            if not edge_id or start == end: continue
 
-            path_points = []
-            for i, point in enumerate(edge['shape']):
-                tx, ty = self._transform_point(point[0], point[1])
-                if i == 0:
-                    path_points.append(cv.Path.MoveTo(tx, ty))
-                else:
-                    path_points.append(cv.Path.LineTo(tx, ty))
+            (x0, y0), *rest = shape_points[start:end]
+            path_points = [cv.Path.MoveTo(x0, y0)]
+            path_points.extend([cv.Path.LineTo(tx, ty) for tx, ty in rest])
             
             path_object = cv.Path(
                 path_points,
@@ -104,20 +126,18 @@ class MapDrawer:
                     stroke_cap=ft.StrokeCap.ROUND
                 )
             )
-            canvas.shapes.append(path_object)
+            new_shapes.append(path_object)
             edge_paths[edge_id] = path_object
         
         # Depois, desenha os nós (cruzamentos) por cima das ruas
-        for node_data in self.nodes.values():
-            if node_data.get('type') != 'traffic_light':
-                tx, ty = self._transform_point(node_data['x'], node_data['y'])
-                
-                node_circle = cv.Circle(
-                    x=tx,
-                    y=ty,
-                    radius=4,
-                    paint=ft.Paint(color=ft.Colors.BLACK)
-                )
-                canvas.shapes.append(node_circle)
+        for tx, ty in canvas_xy[self._plain_node_idx].tolist():
+            node_circle = cv.Circle(
+                x=tx,
+                y=ty,
+                radius=4,
+                paint=ft.Paint(color=ft.Colors.BLACK)
+            )
+            new_shapes.append(node_circle)
         
+        canvas.shapes.extend(new_shapes)
         return edge_paths
\ No newline at end of file
@@ -10,6 +10,12 @@ classes de transformação do Flet (ft.Offset, ft.Scale).
 """
 
 import flet as ft
+import threading
+import time
+
+# Intervalo mínimo entre atualizações durante pan/zoom (~60 por segundo).
+# Os eventos do mouse chegam bem mais rápido; o excesso é agrupado.
+UPDATE_MIN_INTERVAL = 0.016
 
 class MapInteractionHandler:
     """Gerencia o estado e a lógica das interações de pan e zoom do mapa."""
@@ -28,6 +34,45 @@ class MapInteractionHandler:
         self.min_zoom = 0.5
         
         self.on_update = on_update_callback
+        # Controle da taxa de atualização (ver _request_update)
+        self._last_update_ts = 0.0
+        self._update_pending = False
+        self._update_cond = threading.Condition()
+        self._flusher: threading.Thread | None = None
+
+    def _request_update(self):
+        """
+        Chama on_update no máximo a cada UPDATE_MIN_INTERVAL. Um pedido dentro
+        do intervalo só marca uma atualização pendente, que a thread de
+        _flush_loop entrega no fim dele: o último estado do pan/zoom sempre
+        chega à tela, sem criar uma thread por intervalo.
+        """
+        with self._update_cond:
+            now = time.monotonic()
+            if not self._update_pending and now - self._last_update_ts >= UPDATE_MIN_INTERVAL:
+                self._last_update_ts = now
+            else:
+                self._update_pending = True
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="map-update-flush", daemon=True)
+                    self._flusher.start()
+                self._update_cond.notify()
+                return
+        self.on_update()
+
+    def _flush_loop(self):
+        """Thread única (criada no primeiro pedido adiado) que entrega as atualizações pendentes."""
+        while True:
+            with self._update_cond:
+                while not self._update_pending:
+                    self._update_cond.wait()
+                wait = self._last_update_ts + UPDATE_MIN_INTERVAL - time.monotonic()
+                if wait > 0:
+                    self._update_cond.wait(wait)
+                    continue
+                self._update_pending = False
+                self._last_update_ts = time.monotonic()
+            self.on_update()
 
     def center_and_reset_zoom(self):
         """Reseta o estado para a visualização inicial."""
@@ -46,7 +91,7 @@ class MapInteractionHandler:
         self.offset.x += e.delta_x / (1000 * effective_scale)
         self.offset.y += e.delta_y / (1000 * effective_scale)
         
-        self.on_update()
+        self._request_update()
 
     def handle_zoom(self, e: ft.ScrollEvent):
         """Calcula a nova escala do mapa durante um evento de scroll."""
@@ -55,4 +100,4 @@ class MapInteractionHandler:
         else:
             self.scale.scale = max(self.min_zoom, self.scale.scale * 0.9)
             
-        self.on_update()
\ No newline at end of file
+        self._request_update()
\ No newline at end of file
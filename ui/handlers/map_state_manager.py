@@ -45,8 +45,18 @@ class MapStateManager:
         self.selected_semaphore_id: str | None = None
         
         # --- Referências aos widgets de destaque ---
-        self.highlight_casing: cv.Path | None = None
-        self.highlight_foreground: cv.Path | None = None
+        # Os dois caminhos de destaque da rua são criados uma única vez, ocultos,
+        # por cima das ruas já desenhadas; cada seleção só troca os elementos e
+        # a visibilidade deles.
+        self.highlight_casing = cv.Path(
+            elements=[], visible=False,
+            paint=ft.Paint(color=ft.Colors.BLACK, style=ft.PaintingStyle.STROKE, stroke_cap=ft.StrokeCap.ROUND)
+        )
+        self.highlight_foreground = cv.Path(
+            elements=[], visible=False,
+            paint=ft.Paint(color=ft.Colors.YELLOW_ACCENT_400, style=ft.PaintingStyle.STROKE, stroke_cap=ft.StrokeCap.ROUND)
+        )
+        self.canvas.shapes.extend([self.highlight_casing, self.highlight_foreground])
         self.highlight_aura: ft.Container | None = None
 
     def set_selection(self, item_type: str | None, item_id: str | None):
@@ -68,28 +78,23 @@ class MapStateManager:
         self._unhighlight_semaphore()
 
     def _unhighlight_street(self):
-        if self.highlight_casing in self.canvas.shapes:
-            self.canvas.shapes.remove(self.highlight_casing)
-        if self.highlight_foreground in self.canvas.shapes:
-            self.canvas.shapes.remove(self.highlight_foreground)
-        self.highlight_casing = None
-        self.highlight_foreground = None
+        self.highlight_casing.visible = False
+        self.highlight_foreground.visible = False
         self.selected_edge_id = None
 
     def _highlight_street(self, edge_id: str):
         path_object = self.edge_paths.get(edge_id)
         if not path_object: return
 
-        self.highlight_casing = cv.Path(
-            elements=path_object.elements,
-            paint=ft.Paint(stroke_width=path_object.paint.stroke_width + 5, color=ft.Colors.BLACK, style=ft.PaintingStyle.STROKE, stroke_cap=ft.StrokeCap.ROUND)
-        )
-        self.highlight_foreground = cv.Path(
-            elements=path_object.elements,
-            paint=ft.Paint(stroke_width=path_object.paint.stroke_width + 1, color=ft.Colors.YELLOW_ACCENT_400, style=ft.PaintingStyle.STROKE, stroke_cap=ft.StrokeCap.ROUND)
-        )
-        self.canvas.shapes.append(self.highlight_casing)
-        self.canvas.shapes.append(self.highlight_foreground)
+        elements = path_object.elements
+        stroke_width = path_object.paint.stroke_width
+        casing, foreground = self.highlight_casing, self.highlight_foreground
+        casing.elements = elements
+        casing.paint.stroke_width = stroke_width + 5
+        casing.visible = True
+        foreground.elements = elements
+        foreground.paint.stroke_width = stroke_width + 1
+        foreground.visible = True
 
     def _unhighlight_semaphore(self):
         if self.highlight_aura and self.highlight_aura in self.stack.controls:
@@ -15,6 +15,23 @@ from typing import Dict, Any
 import configparser
 import os
 
+# Configurações já lidas, partilhadas entre as instâncias do handler:
+# (caminho do .ini, mtime_ns) -> dicionário de configurações. Uma mudança no
+# arquivo altera o mtime e, portanto, a chave.
+_SETTINGS_CACHE: Dict[tuple[str, int], Dict[str, Any]] = {}
+
+def _coerce_value(raw: str) -> Any:
+    """
+    Converte o texto lido do .ini pelo próprio valor: 'true'/'false' viram
+    bool, textos com '.' viram float e os demais, int. Um valor que não pode
+    ser convertido é mantido como texto.
+    """
+    lowered = raw.lower()
+    if lowered == 'true': return True
+    if lowered == 'false': return False
+    try: return float(raw) if '.' in raw else int(raw)
+    except ValueError: return raw
+
 class SettingsHandler:
     """
     Gerencia a lógica de carregar e validar as configurações da UI.
@@ -36,6 +53,12 @@ class SettingsHandler:
         'weight_emergency_brake': 'REWARD_WEIGHTS', 'weight_teleport': 'REWARD_WEIGHTS'
     }
 
+    # O mesmo mapa invertido (seção -> chaves), para ler cada seção uma única vez.
+    _SECTION_TO_KEYS: Dict[str, list[str]] = {}
+    for _key, _section in _KEY_TO_SECTION_MAP.items():
+        _SECTION_TO_KEYS.setdefault(_section, []).append(_key)
+    del _key, _section
+
     def __init__(self):
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
         self.config_path = os.path.join(project_root, "config", "settings.ini")
@@ -47,31 +70,34 @@ class SettingsHandler:
     def load_settings(self) -> Dict[str, Any]:
         """Lê o arquivo .ini e retorna um dicionário com as configurações."""
         try:
-            if not os.path.exists(self.config_path):
+            try:
+                mtime_ns = os.stat(self.config_path).st_mtime_ns
+            except FileNotFoundError:
                 logging.warning(f"[SettingsHandler] Arquivo {self.config_path} não encontrado. Usando padrões.")
                 return self.get_default_settings()
 
+            cache_key = (self.config_path, mtime_ns)
+            cached = _SETTINGS_CACHE.get(cache_key)
+            if cached is not None:
+                return cached.copy()
+
             self.config.read(self.config_path, encoding='utf-8')
-            loaded_settings = {}
-            for key, section in self._KEY_TO_SECTION_MAP.items():
-                if self.config.has_option(section, key):
-                    value = self.config.get(section, key)
-                    if value.lower() in ['true', 'false']:
-                        loaded_settings[key] = self.config.getboolean(section, key)
-                    elif '.' in value:
-                        try: loaded_settings[key] = self.config.getfloat(section, key)
-                        except ValueError: loaded_settings[key] = value
-                    else:
-                        try: loaded_settings[key] = self.config.getint(section, key)
-                        except ValueError: loaded_settings[key] = value
-                else:
-                    loaded_settings[key] = self._defaults.get(key)
-            
-            for key, value in self._defaults.items():
-                if key not in loaded_settings:
-                    loaded_settings[key] = value
-
-            return loaded_settings
+            # Parte dos padrões; cada seção é lida uma vez e as chaves presentes
+            # são convertidas por _coerce_value.
+            loaded_settings = self._defaults.copy()
+            for section, keys in self._SECTION_TO_KEYS.items():
+                if not self.config.has_section(section):
+                    continue
+                items = dict(self.config.items(section))
+                for key in keys:
+                    raw = items.get(key)
+                    if raw is not None:
+                        loaded_settings[key] = _coerce_value(raw)
+
+            # Só a versão atual do arquivo é mantida em cache.
+            _SETTINGS_CACHE.clear()
+            _SETTINGS_CACHE[cache_key] = loaded_settings
+            return loaded_settings.copy()
         except Exception as e:
             logging.error(f"[SettingsHandler] Erro ao carregar configurações: {e}. Usando padrões.")
             return self.get_default_settings()
@@ -24,6 +24,7 @@ from ui.clients.control_client import ControlClient
 from src.utils.logging_setup import setup_logging
 from ui.handlers.locale_manager import LocaleManager
 from ui.clients.settings_client import SettingsClient
+from ui.clients._executor import shutdown_io
 
 def main(page: ft.Page):
     """Função principal que constrói e configura a página da aplicação Flet."""
@@ -115,6 +116,7 @@ def main(page: ft.Page):
         logging.info("--- O PROGRAMA DA UI FOI ENCERRADO ---")
         if live_data_provider:
             live_data_provider.stop()
+        shutdown_io()
 
     page.on_disconnect = on_disconnect
     live_data_provider.start()
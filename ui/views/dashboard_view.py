@@ -52,8 +52,14 @@ class DashboardView(ft.Container):
         
         self.current_mode = self.locale_manager.get_string("dashboard_view.mode_auto")
 
+    def _sync_animator_selection(self):
+        """Repassa a seleção e o modo atuais ao animador do mapa."""
+        if self.map_widget:
+            self.map_widget.set_animator_selection(self.selected_semaphore_id, self.current_mode)
+
     def update_translations(self, lm: LocaleManager):
         self.current_mode = lm.get_string("dashboard_view.mode_auto")
+        self._sync_animator_selection()
         self.control_panel.update_translations(lm)
         if self.page: self.update()
 
@@ -91,11 +97,13 @@ class DashboardView(ft.Container):
 
     def _handle_panel_close(self):
         self.selected_semaphore_id = None
+        self._sync_animator_selection()
         if self.map_widget:
             self.map_widget.clear_all_selections()
 
     def _handle_mode_change(self, mode: str):
         self.current_mode = mode
+        self._sync_animator_selection()
         # Não precisa de atualizar o painel aqui, o animador fará isso
         if self.selected_semaphore_id:
             # Apenas notifica o handler de estado do mapa para que ele possa redesenhar, se necessário
@@ -105,6 +113,7 @@ class DashboardView(ft.Container):
 
     def _handle_semaphore_click(self, semaphore_id: str | None):
         self.selected_semaphore_id = semaphore_id
+        self._sync_animator_selection()
         
         if not self.control_panel: return
         if not semaphore_id:
@@ -135,6 +144,7 @@ class DashboardView(ft.Container):
 
     def _handle_street_click(self, street_id: str | None):
         self.selected_semaphore_id = None
+        self._sync_animator_selection()
         
         if not self.control_panel: return
         if street_id is None:
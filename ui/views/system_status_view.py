@@ -103,6 +103,10 @@ class SystemStatusView(ft.Container):
         # --- MUDANÇA 3: Inicia a busca de dados de forma assíncrona ---
         self.client.start_fetching_status()
 
+    def will_unmount(self):
+        """Chamado quando o widget sai da página: a busca em andamento é cancelada."""
+        self.client.stop()
+
     # --- MUDANÇA 4: Novos métodos de callback para processar os resultados ---
     def _on_status_loaded(self, response: Dict[str, Any]):
         """Callback executado pelo cliente quando os dados são carregados."""
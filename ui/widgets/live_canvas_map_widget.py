@@ -180,4 +180,9 @@ class LiveCanvasMapWidget(ft.Container):
             widget = self.map_state_manager.traffic_light_widgets.get(semaphore_id)
             if widget:
                 command = {"id": semaphore_id, "state": state}
-                self.animator.command_queue.put(command)
\ No newline at end of file
+                self.animator.post_command(command)
+
+    def set_animator_selection(self, semaphore_id: str | None, mode: str):
+        """Informa ao animador o semáforo selecionado e o modo atual do painel."""
+        if self.animator:
+            self.animator.post_command({"type": "selection", "id": semaphore_id, "mode": mode})
\ No newline at end of file
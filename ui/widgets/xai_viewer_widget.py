@@ -63,6 +63,9 @@ class XaiViewerWidget(ft.Container):
         self.update_translations(self.locale_manager)
         # --- MUDANÇA 2: Inicia a busca assíncrona pela lista de agentes ---
         self.client.start_fetching_agent_list(on_list_loaded_callback=self._on_agent_list_loaded)
+
+    def will_unmount(self):
+        self.client.stop()
         
     # --- MUDANÇA 3: Novo método de callback para popular o dropdown ---
     def _on_agent_list_loaded(self, agent_ids: List[str]):